@@ -112,7 +112,7 @@ else:
 
     from . import c
 
-    def loadDocument(f, import_ifm_attribs=True, ifm_classic=None, crs=None, close_others=False):
+    def loadDocument(f, import_ifm_attribs=True, ifm_classic=None, crs=None, close_others=False, cache_dir=None):
         """
         This replaces the original ifm.loadDocument function.
         it returns a copy of an IFM Document including the ifm_contrib extension.
@@ -120,6 +120,7 @@ else:
         :param import_ifm_attribs: If False (default), do not import classic ifm calls.
         Use this function to prevent Kernel crashes.
         :param crs: set the models coordinate system (Proj4 string)
+        :param cache_dir: if provided, store extracted mesh arrays in this folder and reuse them in later runs
         :return: doctype including ifm_contrib extension
         """
 
@@ -130,7 +131,7 @@ else:
             warnings.warn(DeprecationWarning("ifm_classic is depreciated, use import_ifm_attribs!"))
             import_ifm_attribs = ifm_classic
 
-        return doc_contrib(f, import_ifm_attribs=import_ifm_attribs, crs=crs)
+        return doc_contrib(f, import_ifm_attribs=import_ifm_attribs, crs=crs, cache_dir=cache_dir)
 
 
     class doc_contrib:
@@ -139,7 +140,7 @@ else:
         This class loads the original IfmDocument class and adds the contributors methods.
         """
 
-        def __init__(self, filename, import_ifm_attribs=True, crs=None):
+        def __init__(self, filename, import_ifm_attribs=True, crs=None, cache_dir=None):
             # load document as standard IFM object
             self.pdoc = _loadDocument(filename)
 
@@ -162,6 +163,10 @@ else:
             if crs is not None:
                 self.c.crs = crs
 
+            # enable on-disk mesh cache
+            if cache_dir is not None:
+                self.c.mesh.set_cache(cache_dir, filename)
+
 
         def __getattr__(self, item):
             # if an unknown attribute called, check if doc.pdoc has the atrribute and use it if so.
@@ -258,6 +258,7 @@ class SimWidget:
                     simulation_state = "abort"
 
             # set UI to new state
+        self.doc.c.mesh.values_changed()
         self.time_progress.description = "finished"
         self.time_progress.bar_style = 'success'
         self.button_stop.disabled = False
@@ -176,3 +176,40 @@ class Bdgt:
 
     def get_subdomainbudgettransfer(self, domain, masking_domain, budget_type=Enum.PCLS_FLOW):
         return SubDomainBudgetTransferContrib(self.doc, domain, masking_domain, budget_type)
+
+    def nodal_budget(self, budget="flow", nodes=None):
+        """
+        Return the nodal budget components (boundary conditions, areal fluxes, storage) of the given nodes.
+        One budget handle is created for the call and each node is queried once.
+
+        :param budget: "flow", "mass" or "heat"
+        :type budget:  str
+        :param nodes:  node numbers (default: all nodes)
+        :type nodes:   array-like or None
+        :return:       dict {"bc", "area", "storage": numpy.ndarray}
+        :rtype:        dict
+        """
+        import numpy as np
+
+        if budget == "flow":
+            create, query = self.doc.budgetFlowCreate, self.doc.budgetComponentsQueryFlowAtNode2
+        elif budget == "mass":
+            create, query = self.doc.budgetMassCreate, self.doc.budgetComponentsQueryMassAtNode2
+        elif budget == "heat":
+            create, query = self.doc.budgetHeatCreate, self.doc.budgetComponentsQueryHeatAtNode2
+        else:
+            raise ValueError("budget must be 'flow', 'mass' or 'heat'")
+
+        if nodes is None:
+            nodes = range(self.doc.getNumberOfNodes())
+
+        bc, area, storage = np.empty(len(nodes)), np.empty(len(nodes)), np.empty(len(nodes))
+        bdgt = create()
+        try:
+            for i, n in enumerate(nodes):
+                components = query(bdgt, int(n))
+                bc[i], area[i], storage[i] = components[1], components[2], components[3]
+        finally:
+            self.doc.pdoc.budgetClose(bdgt)
+
+        return {"bc": bc, "area": area, "storage": storage}
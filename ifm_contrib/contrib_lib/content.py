@@ -1,4 +1,6 @@
 from ifm import Enum
+import numpy as np
+
 from .content_pandas import ContentPd
 
 
@@ -7,6 +9,9 @@ class Content:
     Functions regarding accessing information from the Content Panel
     """
 
+    # number of elements queried at once if the kernel has no array-returning content call
+    chunk_size = 65536
+
     def __init__(self, doc):
         self.doc = doc
 
@@ -15,3 +20,70 @@ class Content:
 
     # add custom methods here
 
+    def values(self, content_type, items=None):
+        """
+        Return the elemental content of the given type for all elements (or the given elements) as float64 array.
+        Uses an array-returning kernel call if the FEFLOW version provides one, otherwise the (given) elements are
+        queried in chunks into a preallocated array. If the content type is not available in the model, all values are nan.
+
+        :param content_type: content type, e.g. ifm.Enum.TOTAL_VOLUME (see doc.c.content.df.info())
+        :type content_type:  int
+        :param items:        element numbers (default: all elements)
+        :type items:         array-like or None
+        :return:             numpy.ndarray (float64)
+        """
+        content_type = int(content_type)
+        if items is not None:
+            items = np.asarray(items, dtype=np.int64)
+        try:
+            if hasattr(self.doc, "getElementalContentValues"):
+                values = np.array(self.doc.getElementalContentValues(content_type), dtype=np.float64)
+                return values if items is None else values[items]
+
+            elements = np.arange(self.doc.getNumberOfElements()) if items is None else items
+            values = np.empty(len(elements))
+            for start in range(0, len(elements), self.chunk_size):
+                chunk = elements[start:start + self.chunk_size]
+                values[start:start + len(chunk)] = [self.doc.getElementalContent(content_type, int(e)) for e in chunk]
+            return values
+        except RuntimeError:
+            return np.full(self.doc.getNumberOfElements() if items is None else len(items), np.nan)
+
+    def membership(self, selections):
+        """
+        Return the sparse membership matrix of elemental selections in coordinate format, i.e. the arrays
+        (rows, elements) with rows[k] being the position of the selection in the given list and elements[k] an
+        element of that selection.
+
+        :param selections: names of elemental selections
+        :type selections:  list
+        :return:           tuple (rows, elements) of numpy.ndarray
+        """
+        items = [np.asarray(self.doc.c.sel.list(s, seltype=Enum.SEL_ELEMS), dtype=np.int64) for s in selections]
+        rows = np.repeat(np.arange(len(items)), [len(i) for i in items])
+        elements = np.concatenate(items) if len(items) > 0 else np.zeros(0, dtype=np.int64)
+        return rows, elements
+
+    def totals(self, content_types, selections=None):
+        """
+        Return the content totals of the model domain and of the given elemental selections. Each content type is
+        fetched once; the selection totals are computed in one pass using the selection membership matrix.
+
+        :param content_types: content types (ifm.Enum)
+        :type content_types:  list
+        :param selections:    names of elemental selections
+        :type selections:     list or None
+        :return:              tuple (domain totals, selection totals) of numpy.ndarray, shapes (n_types,) and
+                              (n_types, n_selections)
+        """
+        selections = [] if selections is None else selections
+        rows, elements = self.membership(selections)
+
+        domain = np.zeros(len(content_types))
+        by_selection = np.zeros((len(content_types), len(selections)))
+        for i, content_type in enumerate(content_types):
+            values = self.values(content_type)
+            domain[i] = values.sum()
+            by_selection[i] = np.bincount(rows, weights=values[elements], minlength=len(selections))
+
+        return domain, by_selection
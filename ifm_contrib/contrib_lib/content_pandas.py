@@ -32,49 +32,45 @@ class ContentPd:
 
     def content(self, model_domain=True, selection=None, content_types=True):
         """
-        Get the model domains content (all content items).
+        Get the content of the model domain and of elemental selections.
 
-        :return: DataFrame with all contents
+        :param model_domain:  if True (default), add the content of the model domain (column "Model Domain").
+        :type model_domain:   bool
+        :param selection:     name or list of names of elemental selections to add a column for. If True, all
+                              elemental selections are added.
+        :type selection:      None, bool, str or list
+        :param content_types: content types (ifm.Enum) to return. If True (default), all content types are returned.
+        :type content_types:  bool, int or list
+        :return: DataFrame with content types as index and one column per domain / selection
         :rtype: pandas.DataFrame
         """
 
         # if single selection, make list with single entry
-        if type(selection) != list:
+        if selection is None or selection is False:
+            selection = []
+        elif selection is True:
+            selection = self.doc.c.sel.selections(seltype=Enum.SEL_ELEMS)
+        elif type(selection) != list:
             selection = [selection]
 
         # raise error if selection list entries are invalid
         for s in selection:
-            if s is not None:
-                if type(s) != str:
-                    raise ValueError("selection must be None or str, or a list containing str and/or None members")
-                if self.doc.findSelection == -1:
-                    raise ValueError("No elemental selection '{}' found.".format(s))
+            if type(s) != str:
+                raise ValueError("selection must be None, True, str, or a list of str")
+            if self.doc.findSelection(Enum.SEL_ELEMS, s) == -1:
+                raise ValueError("No elemental selection '{}' found.".format(s))
 
-        # get content by element
-        df_elemental_content = self.doc.c.sel.df.elemental_content(content_types)
+        df_content = self.info()
+        if content_types is True:
+            content_types = list(df_content.index)
+        elif type(content_types) == int:
+            content_types = [content_types]
+        df_content = df_content.loc[content_types]
 
-        for content_type in content_types:
-            for sel in selection:
-                if sel is None:
-                    content = df_elemental_content[content_type].sum()
-                else:
-                    content = df_elemental_content.loc[self.doc.c.sel.list(sel)].TOTAL_VOLUME.sum()
+        domain, by_selection = self.doc.c.content.totals(content_types, selection)
+        if model_domain:
+            df_content["Model Domain"] = domain
+        for i, s in enumerate(selection):
+            df_content[s] = by_selection[:, i]
 
-        # TODO: the 'selection' parameter shall have this behavior:
-        #       None - do nothing
-        #       str - calculate the content of the elemental selection with this name
-        #       [str, str] - calculate the content for multiple selections with this these names
-
-        import numpy as np
-
-        df_content = self.doc.c.content.df.info()
-        df_content["content"] = 0.
-        for i in df_content.index:
-            for e in range(self.doc.getNumberOfElements()):
-                try:
-                    df_content.loc[i, "Model Domain"] += self.doc.getElementalContent(i, e)
-                except StandardError as e:
-                    df_content.loc[i, "Model Domain"] = np.nan
-                    break
-
-        return df_content
\ No newline at end of file
+        return df_content
@@ -1,4 +1,6 @@
 from ifm import Enum
+import numpy as np
+
 from .dfe_pandas import DfePd
 
 
@@ -16,6 +18,67 @@ class Dfe:
 
     # add custom methods here
 
+    # fracture properties available in arrays(): kernel getter and its arguments after the fracture index
+    #   "type_mode":     fracture type, all modes
+    #   "type_mode_law": fracture type, all modes, all laws
+    #   "all":           all types, all modes, all laws
+    properties = {"law": ("getFracLaw", "type_mode"),
+                  "area": ("getFracArea", "type_mode_law"),
+                  "diameter": ("getFracElementDiameter", None),
+                  "conductivity": ("getFracFlowConductivity", "all"),
+                  "storativity": ("getFracFlowStorativity", "all"),
+                  "compressibility": ("getFracFlowCompressibility", "all"),
+                  "sinksource": ("getFracFlowSinkSource", "all")}
+
+    def arrays(self, properties=None):
+        """
+        Return the discrete feature elements and their properties as arrays, queried in a single pass over all
+        DFE. 1D fractures (2 nodes) and 2D fractures (faces with 3 or 4 nodes) are supported.
+
+        :param properties: names of the properties to query (see Dfe.properties), default all.
+        :type properties:  list or None
+        :return:           dict with the incidence in CSR format ("n_nodes", "offsets", "nodes") and as (n, 4) array
+                           padded with -1 ("incidence"), the fracture type ("type", ifm.Enum.FRAC_1D or FRAC_2D) and
+                           one array per property (int32 for "law", float64 otherwise).
+        :rtype:            dict
+        """
+        if properties is None:
+            properties = list(self.properties)
+        for name in properties:
+            if name not in self.properties:
+                raise ValueError("unknown property {}, available: {}".format(name, ", ".join(self.properties)))
+
+        n = self.doc.getNumberOfTotalFractureElements()
+        incidence = np.full((n, 4), -1, dtype=np.int32)
+        n_nodes = np.zeros(n, dtype=np.int32)
+        frac_type = np.zeros(n, dtype=np.int32)
+        values = {name: np.empty(n, dtype=np.int32 if name == "law" else np.float64) for name in properties}
+        getters = [(values[name], getattr(self.doc, self.properties[name][0]), self.properties[name][1])
+                   for name in properties]
+
+        for f in range(n):
+            nodes = self.doc.getNodalArrayOfFractureElement(f)
+            n_nodes[f] = len(nodes)
+            incidence[f, :len(nodes)] = nodes
+            ftype = Enum.FRAC_1D if len(nodes) == 2 else Enum.FRAC_2D
+            frac_type[f] = ftype
+            for array, get, args in getters:
+                if args is None:
+                    array[f] = get(f)
+                elif args == "type_mode":
+                    array[f] = get(f, ftype, Enum.ALL_FRAC_MODES)
+                elif args == "type_mode_law":
+                    array[f] = get(f, ftype, Enum.ALL_FRAC_MODES, Enum.ALL_FRAC_LAWS)
+                else:
+                    array[f] = get(f, Enum.ALL_FRAC_TYPES, Enum.ALL_FRAC_MODES, Enum.ALL_FRAC_LAWS)
+
+        offsets = np.zeros(n + 1, dtype=np.int64)
+        np.cumsum(n_nodes, out=offsets[1:])
+        arrays = {"n_nodes": n_nodes, "offsets": offsets, "nodes": incidence[incidence >= 0], "type": frac_type,
+                  "incidence": incidence}
+        arrays.update(values)
+        return arrays
+
     def setFracArea(self, fracid, value):
         """
         Set a new cross-section area for the given DFE
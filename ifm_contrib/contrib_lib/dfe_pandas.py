@@ -1,6 +1,3 @@
-from ifm import Enum
-
-
 class DfePd:
     """
     Functions regarding Discrete Feature Elements using Pandas.
@@ -17,26 +14,29 @@ class DfePd:
         import pandas as pd
         import numpy as np
 
-        df_nodes = self.doc.c.mesh.df.nodes()
+        arrays = self.doc.c.dfe.arrays()
+        x, y, _ = self.doc.c.mesh.topology().coordinates(global_cos=True)
 
-        df_dfe = pd.DataFrame(
-            [self.doc.getNodalArrayOfFractureElement(f) for f in range(self.doc.getNumberOfTotalFractureElements())],
-            columns=["node_1", "node_2"])
+        n_columns = max(2, int(arrays["n_nodes"].max(initial=2)))
+        df_dfe = pd.DataFrame(arrays["incidence"][:, :n_columns],
+                              columns=["node_{}".format(k + 1) for k in range(n_columns)])
         df_dfe.index.name = "dfe"
-        df_dfe["Law"] = [self.doc.getFracLaw(f, Enum.FRAC_1D, Enum.ALL_FRAC_MODES) for f in
-                         range(self.doc.getNumberOfTotalFractureElements())]
-
-        df_dfe["Area"] = [self.doc.getFracArea(f, Enum.FRAC_1D, Enum.ALL_FRAC_MODES, Enum.ALL_FRAC_TYPES) for f in df_dfe.index ]        
-        df_dfe["Conductivity"] = [self.doc.getFracFlowConductivity(f, Enum.ALL_FRAC_TYPES, Enum.ALL_FRAC_MODES, Enum.ALL_FRAC_LAWS) for f in df_dfe.index ]
-        df_dfe["Storativity"] = [self.doc.getFracFlowStorativity(f, Enum.ALL_FRAC_TYPES, Enum.ALL_FRAC_MODES, Enum.ALL_FRAC_LAWS) for f in df_dfe.index ]
-        df_dfe["Compressibility"] = [self.doc.getFracFlowCompressibility(f, Enum.ALL_FRAC_TYPES, Enum.ALL_FRAC_MODES, Enum.ALL_FRAC_LAWS) for f in df_dfe.index ]
-        df_dfe["SinkSource"] = [self.doc.getFracFlowSinkSource(f, Enum.ALL_FRAC_TYPES, Enum.ALL_FRAC_MODES, Enum.ALL_FRAC_LAWS) for f in df_dfe.index ]
+        df_dfe["Type"] = arrays["type"]
+        df_dfe["Law"] = arrays["law"]
+        df_dfe["Area"] = arrays["area"]
+        df_dfe["Conductivity"] = arrays["conductivity"]
+        df_dfe["Storativity"] = arrays["storativity"]
+        df_dfe["Compressibility"] = arrays["compressibility"]
+        df_dfe["SinkSource"] = arrays["sinksource"]
+
+        node_1, node_2 = arrays["incidence"][:, 0], arrays["incidence"][:, 1]
+        df_dfe["x1"] = x[node_1]
+        df_dfe["x2"] = x[node_2]
+        df_dfe["y1"] = y[node_1]
+        df_dfe["y2"] = y[node_2]
+        # length of 1D fractures, nan for 2D fractures
+        df_dfe["length"] = np.where(arrays["n_nodes"] == 2, np.hypot(x[node_1] - x[node_2], y[node_1] - y[node_2]),
+                                    np.nan)
+        df_dfe["ElementDiameter"] = arrays["diameter"]
 
-        df_dfe["x1"] = np.array(df_nodes.loc[df_dfe.node_1].X)
-        df_dfe["x2"] = np.array(df_nodes.loc[df_dfe.node_2].X)
-        df_dfe["y1"] = np.array(df_nodes.loc[df_dfe.node_1].Y)
-        df_dfe["y2"] = np.array(df_nodes.loc[df_dfe.node_2].Y)
-        df_dfe["length"] = ((df_dfe.x1 - df_dfe.x2) ** 2 + (df_dfe.y1 - df_dfe.y2) ** 2) ** 0.5
-        df_dfe["ElementDiameter"] = [self.doc.getFracElementDiameter(f) for f in df_dfe.index]
-        
         return df_dfe
@@ -1,7 +1,11 @@
 from ifm import Enum
+import numpy as np
 
+from .mesh_cache import MeshCache
 from .mesh_geopandas import MeshGpd
 from .mesh_pandas import MeshPd
+from .mesh_locator import PointLocation, PointLocator
+from .mesh_topology import MeshTopology
 
 
 class Mesh:
@@ -9,6 +13,9 @@ class Mesh:
     Functions to obtain data of FEFLOWs Data Panel.
     """
 
+    # names of the parameter constants of ifm.Enum, see parameter_names()
+    _parameter_names = None
+
     def __init__(self, doc):
         self.doc = doc
 
@@ -16,8 +23,47 @@ class Mesh:
         self.df = MeshPd(doc)
         self.gdf = MeshGpd(doc)
 
+        # cached mesh topology, see topology()
+        self._topology = None
+        self._locator = None
+
+        # optional on-disk cache, see set_cache()
+        self.cache = None
+        self._cache_fingerprint = None
+        self._cache_valid = None
+
+        # cached parameter catalog, see parameter_catalog()
+        self._parameter_catalog = None
+        self._parameter_catalog_key = None
+
+        # counter of value changes, see values_changed()
+        self.values_version = 0
+
     # add custom methods here
 
+    # all known aux items, see available_aux()
+    aux_items = {"elemental": ['auxAquiferThickness',
+                               'auxAspectRatio',
+                               'auxAspectRatioBeta',
+                               'auxAspectRatioGamma',
+                               'auxCFLCondition',
+                               'auxConditionNumber',
+                               'auxCourantNumber',
+                               'auxDelaunayViolatingTriangles',
+                               'auxElementalVolumes',
+                               'auxElementDiameter',
+                               'auxLayerThickness',
+                               'auxMaxDihedralAngles',
+                               'auxMinDihedralAngles',
+                               'auxPecletNumber',
+                               'auxPseudoSat',
+                               'auxQuadrangleMaxAngles',
+                               'auxRelPerm',
+                               'auxSquishIndex',
+                               'auxTriangleMaxAngles'],
+                 "nodal": ['auxSliceDistance',
+                           'auxNodalDepth']}
+
     def available_aux(self, silent=True, show_unavailable=False):
         """
         returns a dictionary with available auxiliary data items (separate for nodal and elemental items).
@@ -26,49 +72,13 @@ class Mesh:
         :return:
         """
 
-        # define lists of all known aux items
-        aux_E_strings = ['auxAquiferThickness',
-                         'auxAspectRatio',
-                         'auxAspectRatioBeta',
-                         'auxAspectRatioGamma',
-                         'auxCFLCondition',
-                         'auxConditionNumber',
-                         'auxCourantNumber',
-                         'auxDelaunayViolatingTriangles',
-                         'auxElementalVolumes',
-                         'auxElementDiameter',
-                         'auxLayerThickness',
-                         'auxMaxDihedralAngles',
-                         'auxMinDihedralAngles',
-                         'auxPecletNumber',
-                         'auxPseudoSat',
-                         'auxQuadrangleMaxAngles',
-                         'auxRelPerm',
-                         'auxSquishIndex',
-                         'auxTriangleMaxAngles']
-
-        aux_N_strings = ['auxSliceDistance',
-                         'auxNodalDepth']
-
-        # check for existence - elemental
-        elemental_avail = []
-        elemental_unavail = []
-        for auxid in aux_E_strings:
-            param = self.doc.getParameter(Enum.P_AUXDIST_E, auxid)
-            if param != None:
-                elemental_avail.append(auxid)
-            else:
-                elemental_unavail.append(auxid)
-
-        # check for existence - elemental
-        nodal_avail = []
-        nodal_unavail = []
-        for auxid in aux_N_strings:
-            param = self.doc.getParameter(Enum.P_AUXDIST_N, auxid)
-            if param != None:
-                nodal_avail.append(auxid)
-            else:
-                nodal_unavail.append(auxid)
+        df_aux = self.parameter_catalog()
+        df_aux = df_aux[df_aux.Aux]
+
+        elemental_avail = list(df_aux[(df_aux.Type == "elemental") & df_aux.Available].index)
+        elemental_unavail = list(df_aux[(df_aux.Type == "elemental") & ~df_aux.Available].index)
+        nodal_avail = list(df_aux[(df_aux.Type == "nodal") & df_aux.Available].index)
+        nodal_unavail = list(df_aux[(df_aux.Type == "nodal") & ~df_aux.Available].index)
 
         # print to screen
         if not silent:
@@ -90,6 +100,328 @@ class Mesh:
         return {"nodal" : nodal_avail,
                 "elemental" : elemental_avail}
 
+    def parameter_catalog(self, rebuild=False):
+        """
+        Return the catalog of model parameters (all P_ constants of ifm.Enum with data in the model) and aux items.
+        The catalog is built once and reused until the problem class or the mesh changes.
+
+        Columns: Enum_Constant (parameter id, -1 for aux items), Type ("nodal", "elemental", "ambiguous" if the
+        number of nodes equals the number of elements, or "unknowm"), Size (number of values), Aux (True for aux
+        items) and Available (False for aux items not provided by the model).
+
+        :param rebuild: If True, discard the cached catalog and rebuild it.
+        :type rebuild:  bool
+        :return:        DataFrame with the parameter names as index
+        :rtype:         pandas.DataFrame
+        """
+        import pandas as pd
+
+        key = (self.doc.pdoc.getProblemClass(), MeshTopology.get_fingerprint(self.doc))
+        if rebuild or self._parameter_catalog is None or self._parameter_catalog_key != key:
+            n_nodes, n_elements = self.doc.getNumberOfNodes(), self.doc.getNumberOfElements()
+
+            rows = []
+            for name, par_id in self.parameter_names(reverse=True).items():
+                try:
+                    size = self.doc.getParamSize(par_id)
+                except Exception:
+                    continue
+                if size == n_nodes and size == n_elements:
+                    itemtype = 'ambiguous'  # n_nodes = n_elements, can't determine type
+                elif size == n_nodes:
+                    itemtype = 'nodal'
+                elif size == n_elements:
+                    itemtype = 'elemental'
+                else:
+                    itemtype = 'unknowm'
+                rows.append((name, par_id, itemtype, size, False, True))
+
+            for itemtype, aux_par in [("elemental", Enum.P_AUXDIST_E), ("nodal", Enum.P_AUXDIST_N)]:
+                for name in self.aux_items[itemtype]:
+                    try:
+                        available = self.doc.getParameter(aux_par, name) is not None
+                    except Exception:
+                        available = False  # aux items require FEFLOW 7.4 or higher
+                    rows.append((name, -1, itemtype, n_nodes if itemtype == "nodal" else n_elements, True, available))
+
+            df_catalog = pd.DataFrame(rows, columns=["Name", "Enum_Constant", "Type", "Size", "Aux", "Available"])
+            self._parameter_catalog = df_catalog.set_index("Name")
+            self._parameter_catalog_key = key
+
+        return self._parameter_catalog
+
+    @staticmethod
+    def parameter_names(reverse=False):
+        """
+        Return a dictionary {parameter id: name} of all P_ constants of ifm.Enum (or {name: parameter id} if
+        reverse is True).
+        """
+        if Mesh._parameter_names is None:
+            Mesh._parameter_names = {e: getattr(Enum, e) for e in dir(Enum) if e.startswith("P_") and e != "P_INVALID"}
+        if reverse:
+            return Mesh._parameter_names
+        names = {}
+        for name, par_id in Mesh._parameter_names.items():
+            names.setdefault(par_id, name)
+        return names
+
+    def parameter_name(self, par_id):
+        """
+        Return the name of the ifm.Enum constant of a parameter id (e.g. "P_HEAD"), or the id as string if unknown.
+        """
+        return self.parameter_names().get(par_id, str(par_id))
+
+    def topology(self, rebuild=False):
+        """
+        Return the array-backed mesh topology (incidence matrix, element types, active mask, coordinates).
+        The object is built on first call and reused until the mesh changes. Node coordinates are re-read from the
+        kernel on every call, the active mask on every access.
+
+        :param rebuild: If True, discard the cached topology and rebuild it.
+        :type rebuild:  bool
+        :return:        MeshTopology
+        """
+        if rebuild or self._topology is None or not self._topology.is_valid():
+            self._topology = None
+            if self._use_cache() and not rebuild:
+                arrays = self.cache.load("topology")
+                if arrays is not None:
+                    self._topology = MeshTopology(self.doc, arrays=arrays)
+                    self._topology.update_coordinates()
+            if self._topology is None:
+                self._topology = MeshTopology(self.doc)
+                if self._use_cache():
+                    self.cache.save("topology", self._topology.arrays())
+        else:
+            self._topology.update_coordinates()
+        return self._topology
+
+    def values_changed(self):
+        """
+        Notify that parameter or distribution values have changed, e.g. after doc.setParamValues() or a simulation
+        run. Lazy frames (see doc.c.mesh.df.nodes(lazy=True)) discard their fetched columns on next access. Called by
+        doc.c.sim.start() and doc.c.user.create().
+        """
+        self.values_version += 1
+
+    def set_cache(self, cache_dir, filename=None):
+        """
+        Enable an on-disk cache for mesh arrays (topology, coordinates and borders) extracted from the model file.
+        Later runs on the same (unmodified) file memory-map the cached arrays instead of querying the kernel.
+        Before first use, cached arrays are checked against the mesh in memory (node counts, node coordinates and a
+        sample of the incidence matrix); the cache is not used if they differ, e.g. if the mesh was edited after
+        loading. Node coordinates are always re-read from the kernel, see topology().
+
+        :param cache_dir: folder to store the cache in
+        :type cache_dir:  str
+        :param filename:  model file (default: the file the document was loaded from)
+        :type filename:   str
+        """
+        if filename is None:
+            filename = self.doc.c.original_filename
+        self.cache = MeshCache(cache_dir, filename)
+        self._cache_fingerprint = MeshTopology.get_fingerprint(self.doc)
+        self._cache_valid = None
+
+    def _use_cache(self):
+        """
+        Return True if the on-disk cache is enabled and matches the mesh in memory.
+        """
+        if self.cache is None or MeshTopology.get_fingerprint(self.doc) != self._cache_fingerprint:
+            return False
+        if self._cache_valid is None:
+            arrays = self.cache.load("topology")
+            self._cache_valid = arrays is None or MeshTopology(self.doc, arrays=arrays).matches_kernel()
+        return self._cache_valid
+
+    def locate(self, points, global_cos=True, slice=None):
+        """
+        Find the elements containing the given points and the interpolation weights of the element nodes.
+        Points are located in the 2D footprint using a spatial index; in layered 3D meshes, the layer is found from
+        the z coordinate of the points, or the points are projected on the given slice.
+
+        :param points:     coordinates as array-like of shape (n, 2) or (n, 3)
+        :type points:      array-like
+        :param global_cos: If True (default), points are given in the global coordinate system.
+        :type global_cos:  bool
+        :param slice:      In 3D models, locate points in the given slice instead of using z coordinates.
+        :type slice:       int or None
+        :return:           PointLocation with arrays elements (-1 if not found), nodes and weights
+        """
+        topology = self.topology()
+        if self._locator is None or self._locator.topology is not topology or \
+                self._locator.coordinates_version != topology.coordinates_version:
+            self._locator = PointLocator(topology)
+        return self._locator.locate(points, global_cos=global_cos, slice=slice)
+
+    def _item_values(self, item_type, par=None, expr=None, distr=None, values=None):
+        """
+        Return nodal or elemental values of a parameter, expression or distribution (or the given values) as float64
+        numpy array with no-data (-99999) as nan. Given values are only copied if they contain no-data values.
+
+        :param item_type: "NODAL" or "ELEMENTAL"
+        :type item_type:  str
+        """
+        if item_type == "NODAL":
+            get_distr_id, get_distr_values = self.doc.getNodalRefDistrIdByName, self.doc.getNodalRefDistrValues
+        elif item_type == "ELEMENTAL":
+            get_distr_id, get_distr_values = self.doc.getElementalRefDistrIdByName, self.doc.getElementalRefDistrValues
+        else:
+            raise ValueError("item_type must be 'NODAL' or 'ELEMENTAL'")
+
+        if par is not None:
+            self.doc.getParamSize(par)  # workaround for a crashbug in FEFLOW
+            values = self.doc.getParamValues(par)
+        elif expr is not None:
+            values = self.doc.c.user.expr_values(expr, item_type=item_type)
+        elif distr is not None:
+            if type(distr) == str:
+                distrID = get_distr_id(distr)
+            elif type(distr) == int:
+                distrID = distr
+            else:
+                raise ValueError("distr must be string (for name) or integer (for id)")
+            if distrID == -1:
+                raise ValueError("Distribution " + str(distr) + " not found!")
+            values = get_distr_values(distrID)
+        elif values is None:
+            raise ValueError("either of parameter par, expr, distr or values must be provided!")
+        else:
+            values = np.asarray(values, dtype=np.float64)
+            no_data = values == -99999.0
+            if no_data.any():
+                values = values.copy()
+                values[no_data] = np.nan
+            return values
+
+        values = np.array(values, dtype=np.float64)
+        values[values == -99999.0] = np.nan
+        return values
+
+    def velocity(self, items=None):
+        """
+        Return the nodal velocity components of the current results as contiguous float64 arrays.
+        Uses array-returning kernel calls if the FEFLOW version provides them, otherwise all components are queried
+        in a single pass over the nodes. The norm is computed from the components.
+
+        :param items: node numbers (default: all nodes)
+        :type items:  array-like or None
+        :return:      dict {"v_x", "v_y", "v_z" (3D only), "v_norm": numpy.ndarray}
+        :rtype:       dict
+        """
+        is_3d = self.doc.getNumberOfDimensions() == 3
+        components = ["X", "Y", "Z"] if is_3d else ["X", "Y"]
+
+        if all(hasattr(self.doc, "getResults{}VelocityValues".format(c)) for c in components):
+            arrays = [np.asarray(getattr(self.doc, "getResults{}VelocityValues".format(c))(), dtype=np.float64)
+                      for c in components]
+            if items is not None:
+                items = np.asarray(items, dtype=np.int64)
+                arrays = [a[items] for a in arrays]
+        else:
+            if items is None:
+                items = range(self.doc.getNumberOfNodes())
+            getters = [getattr(self.doc, "getResults{}VelocityValue".format(c)) for c in components]
+            arrays = [np.empty(len(items)) for _ in components]
+            for i, n in enumerate(items):
+                n = int(n)
+                for array, get in zip(arrays, getters):
+                    array[i] = get(n)
+
+        velocity = {"v_" + c.lower(): a for c, a in zip(components, arrays)}
+        velocity["v_norm"] = np.sqrt(sum(a ** 2 for a in arrays))
+        return velocity
+
+    def slice_array(self, par=None, expr=None, distr=None, values=None):
+        """
+        Return nodal values of a layered model as 2D array of shape (n_slices, nodes_per_slice), i.e. indexed by
+        [slice - 1, top node]. The array is a reshaped view of the flat nodal array, so vertical operations like
+        depth-averaging or per-column maxima become reductions along axis 0.
+
+        :param par:    Parameter (ifm.Enum)
+        :type par:     ifm.Enum
+        :param expr:   Name or id of a nodal user expression
+        :type expr:    str or int
+        :param distr:  Name or id of a nodal user distribution
+        :type distr:   str or int
+        :param values: nodal values (length number of nodes). float64 numpy arrays without no-data values are
+                       reshaped without copy.
+        :type values:  array-like
+        :return:       numpy.ndarray of shape (n_slices, nodes_per_slice)
+        """
+        n_slices, nps = self.doc.getNumberOfSlices(), self.doc.getNumberOfNodesPerSlice()
+        if self.doc.getNumberOfNodes() != n_slices * nps:
+            raise ValueError("model is not fully layered, nodes can not be arranged by slice.")
+
+        values = self._item_values("NODAL", par=par, expr=expr, distr=distr, values=values)
+        return values.reshape(n_slices, nps)
+
+    def layer_array(self, par=None, expr=None, distr=None, values=None):
+        """
+        Return elemental values of a layered model as 2D array of shape (n_layers, elements_per_layer), i.e. indexed by
+        [layer - 1, top element]. The array is a reshaped view of the flat elemental array.
+
+        :param par:    Parameter (ifm.Enum)
+        :type par:     ifm.Enum
+        :param expr:   Name or id of an elemental user expression
+        :type expr:    str or int
+        :param distr:  Name or id of an elemental user distribution
+        :type distr:   str or int
+        :param values: elemental values (length number of elements). float64 numpy arrays without no-data values
+                       are reshaped without copy.
+        :type values:  array-like
+        :return:       numpy.ndarray of shape (n_layers, elements_per_layer)
+        """
+        ee = self.doc.getNumberOfElementsPerLayer()
+        n_layers = self.doc.getNumberOfElements() // ee if ee > 0 else 0
+        if self.doc.getNumberOfLayers() == -1 or self.doc.getNumberOfElements() != n_layers * ee:
+            raise ValueError("model is not fully layered, elements can not be arranged by layer.")
+
+        values = self._item_values("ELEMENTAL", par=par, expr=expr, distr=distr, values=values)
+        return values.reshape(n_layers, ee)
+
+    def interpolate(self, points, par=None, expr=None, distr=None, values=None, global_cos=True, slice=None):
+        """
+        Interpolate a nodal parameter, expression or distribution at arbitrary points.
+        Points can be given as coordinates or as PointLocation returned by locate(), which avoids locating the same
+        points again (e.g. in every time step).
+
+        :param points:     coordinates as array-like of shape (n, 2) or (n, 3), or a PointLocation
+        :type points:      array-like or PointLocation
+        :param par:        Parameter to interpolate (ifm.Enum)
+        :type par:         ifm.Enum
+        :param expr:       Name or id of a nodal user expression
+        :type expr:        str or int
+        :param distr:      Name or id of a nodal user distribution
+        :type distr:       str or int
+        :param values:     nodal values (length number of nodes)
+        :type values:      array-like
+        :param global_cos: If True (default), points are given in the global coordinate system.
+        :type global_cos:  bool
+        :param slice:      In 3D models, interpolate in the given slice instead of using z coordinates.
+        :type slice:       int or None
+        :return:           numpy.ndarray of interpolated values, nan for points outside the mesh
+        """
+        if isinstance(points, PointLocation):
+            location = points
+        else:
+            location = self.locate(points, global_cos=global_cos, slice=slice)
+
+        values = self._item_values("NODAL", par=par, expr=expr, distr=distr, values=values)
+        return location.interpolate(values)
+
+    def _layer_range(self, layer):
+        """
+        Return the range of element numbers of the given layer (all elements in 2D).
+        """
+        ee = self.doc.getNumberOfElementsPerLayer()
+        if self.doc.getNumberOfDimensions() == 2:
+            return range(self.doc.getNumberOfElements())
+        elif self.doc.getNumberOfDimensions() == 3:
+            return range((layer - 1) * ee, layer * ee)
+        else:
+            raise NotImplementedError(str(self.doc.getNumberOfDimensions()) + " dimensions not supported")
+
     def get_imatrix(self, layer=None, split_quads_to_triangles=False, ignore_inactive=False, return_elements=False):
         """
         return the incidence matrix as [[int]].
@@ -103,47 +435,27 @@ class Mesh:
         if layer is not None and (layer > self.doc.getNumberOfLayers() or layer <= 0):
             raise ValueError("layer number out of range.")
 
-        ee = self.doc.getNumberOfElementsPerLayer()
-        eee = self.doc.getNumberOfElements()
-
         if layer is None:
             element_range = range(self.doc.getNumberOfElements())
         else:
-            if self.doc.getNumberOfDimensions() == 2:
-                element_range = range(eee)
-            elif self.doc.getNumberOfDimensions() == 3:
-                element_range = range((layer - 1) * ee, layer * ee)
-            else:
-                raise NotImplementedError(str(self.doc.getNumberOfDimensions()) + " dimensions not supported")
-
-        imat = []
-        inactive = set()
-        for e in element_range:
-            if ignore_inactive and not self.doc.getMatElementActive(e):
-                inactive.add(e)
-                continue
-            NN = self.doc.getNumberOfElementNodes(e)
-            el_nodes = [self.doc.getNode(e, N) for N in range(NN)]
-            if split_quads_to_triangles:
-                if NN == 3 or NN == 6:
-                    imat.append(el_nodes)
-                elif NN == 4:
-                    imat.append([el_nodes[1], el_nodes[2], el_nodes[3]])  # split quadrangle in 2 triangles
-                    imat.append([el_nodes[3], el_nodes[0], el_nodes[1]])
-                elif NN == 8:
-                    imat.append([el_nodes[1], el_nodes[2], el_nodes[3], el_nodes[5], el_nodes[6],
-                                 el_nodes[7]])  # split quadrangle in 2 triangles
-                    imat.append([el_nodes[3], el_nodes[0], el_nodes[1], el_nodes[7], el_nodes[4], el_nodes[5]])
-
-                    # imat.append(el_nodes[:3] + el_nodes[4:7])  # split 8-noded prism into 2 6-noded prisms
-                    # imat.append(el_nodes[1:4] + el_nodes[4:])
-                else:
-                    raise NotImplementedError(str(NN) + "-noded element not supported")
-            else:
-                imat.append(el_nodes)
+            element_range = self._layer_range(layer)
+
+        topology = self.topology()
+        elements = np.arange(element_range.start, element_range.stop)
+        if ignore_inactive:
+            elements = elements[topology.active_mask(elements)]
+
+        if split_quads_to_triangles:
+            patterns = {3: [[0, 1, 2]],
+                        6: [[0, 1, 2, 3, 4, 5]],
+                        4: [[1, 2, 3], [3, 0, 1]],  # split quadrangle in 2 triangles
+                        8: [[1, 2, 3, 5, 6, 7], [3, 0, 1, 7, 4, 5]]}  # split hexahedron in 2 prisms
+        else:
+            patterns = None
+        imat, _ = topology.rows(elements, patterns)
 
         if return_elements:
-            return imat, list(set(element_range) - inactive)
+            return imat, elements.tolist()
         else:
             return imat
 
@@ -161,40 +473,24 @@ class Mesh:
         if slice > self.doc.getNumberOfSlices() or slice <= 0:
             raise ValueError("slice number out of range.")
 
-        ee = self.doc.getNumberOfElementsPerLayer()
-        eee = self.doc.getNumberOfElements()
-
-        if self.doc.getNumberOfDimensions() == 2:
-            element_range = range(eee)
-        elif self.doc.getNumberOfDimensions() == 3:
-            element_range = range((layer - 1) * ee, layer * ee)
-        else:
-            raise NotImplementedError(str(self.doc.getNumberOfDimensions()) + " dimensions not supported")
+        element_range = self._layer_range(layer)
 
-        imat = []
-        inactive = set()
-        for e in element_range:
-            if ignore_inactive and not self.doc.getMatElementActive(e):
-                inactive.add(e)
-                continue
+        topology = self.topology()
+        elements = np.arange(element_range.start, element_range.stop)
+        if ignore_inactive:
+            elements = elements[topology.active_mask(elements)]
 
-            NN = self.doc.getNumberOfElementNodes(e)
-            el_nodes = [self.doc.getNode(e, N) for N in range(NN)]
-            if split_quads_to_triangles:
-                if NN == 3:
-                    imat.append(el_nodes)
-                elif NN == 6:
-                    imat.append(el_nodes[:3])  # top nodes only
-                elif NN == 4 or NN == 8:
-                    imat.append([el_nodes[1], el_nodes[2], el_nodes[3]])  # split quadrangle in 2 triangles
-                    imat.append([el_nodes[3], el_nodes[0], el_nodes[1]])
-                else:
-                    raise NotImplementedError(str(NN) + "-noded element not supported")
-            else:
-                imat.append(el_nodes)
+        if split_quads_to_triangles:
+            patterns = {3: [[0, 1, 2]],
+                        6: [[0, 1, 2]],  # top nodes only
+                        4: [[1, 2, 3], [3, 0, 1]],  # split quadrangle in 2 triangles
+                        8: [[1, 2, 3], [3, 0, 1]]}
+        else:
+            patterns = None
+        imat, _ = topology.rows(elements, patterns)
 
         if return_elements:
-            return (imat, list(set(element_range) - inactive))
+            return (imat, elements.tolist())
         else:
             return imat
 
@@ -207,54 +503,36 @@ class Mesh:
         :return: tuple(numpy.Array) (x, y, imat)
         """
 
-        import numpy as np
-
-        if global_cos:
-            X0 = self.doc.getOriginX()
-            Y0 = self.doc.getOriginY()
-        else:
-            X0 = Y0 = 0
-
         if self.doc.getNumberOfDimensions() == 2:
-            nn = self.doc.getNumberOfNodesPerSlice()
             ee = self.doc.getNumberOfElementsPerLayer()
             stop = 1
         elif layer is not None or as_2d:
-            nn = self.doc.getNumberOfNodesPerSlice()
             ee = self.doc.getNumberOfElementsPerLayer()
             stop = 2
         else:
-            nn = self.doc.getNumberOfNodes()
             ee = self.doc.getNumberOfElements()
             stop = 1
 
-        x = np.array(self.doc.getParamValues(Enum.P_MSH_X)[:nn]) + X0
-        y = np.array(self.doc.getParamValues(Enum.P_MSH_Y)[:nn]) + Y0
-
-        # x = np.array([self.doc.getX(n) + X0 for n in range(nn)])
-        # y = np.array([self.doc.getY(n) + Y0 for n in range(nn)])
-
-        imat = []
-
-        for e in range(ee):  # PerLayer
-
-            if ignore_inactive and not self.doc.getMatElementActive(e):
-                continue
-
-            NN = int(self.doc.getNumberOfElementNodes(e) / stop)
-            element_nodes = [self.doc.getNode(e, N) for N in range(NN)]
+        topology = self.topology(rebuild=not use_cache)
+        elements = np.arange(ee)
+        if ignore_inactive:
+            elements = elements[topology.active_mask(elements)]
 
+        # patterns are given per number of element nodes, NN is the number of nodes used (half for 2D of 3D)
+        patterns = {}
+        for element_nn in np.unique(topology.nn[elements]):
+            NN = int(element_nn) // stop
             if split_quads_to_triangles:
                 if NN == 3:
-                    imat.append(element_nodes)
+                    patterns[int(element_nn)] = [[0, 1, 2]]
                 elif NN == 4:
-                    imat.append(element_nodes[:3])  # split quadrangle in 2 triangles
-                    imat.append(element_nodes[1:])
+                    patterns[int(element_nn)] = [[0, 1, 2], [1, 2, 3]]  # split quadrangle in 2 triangles
                 else:
                     raise ValueError(str(NN * 2) + "-noded element not supported")
             else:
-                imat.append(element_nodes)
+                patterns[int(element_nn)] = [list(range(NN))]
 
+        imat, _ = topology.rows(elements, patterns)
         return imat
 
     def getCentroid(self, item, localcos=False, itemtype=Enum.SEL_ELEMENTAL):
@@ -303,43 +581,103 @@ class Mesh:
 
         :return:
         """
+        if self._use_cache():
+            arrays = self.cache.load("borders")
+            if arrays is not None:
+                offsets, nodes = arrays["offsets"], arrays["nodes"]
+                return {border: nodes[offsets[border]:offsets[border + 1]].tolist()
+                        for border in range(len(offsets) - 1)}
+
         borders = {}
         for border in range(self.doc.getNumberOfBorders()):
             borders[border] = [self.doc.getBorderNode(border, n) for n in
                                range(self.doc.getNumberOfBorderNodes(border))]
+
+        if self._use_cache():
+            offsets = np.zeros(len(borders) + 1, dtype=np.int64)
+            np.cumsum([len(borders[border]) for border in borders], out=offsets[1:])
+            nodes = np.array([n for border in borders for n in borders[border]], dtype=np.int32)
+            self.cache.save("borders", {"offsets": offsets, "nodes": nodes})
+
         return borders
 
     def mlw(self, global_cos=True):
         """
         Return a dictionary with information on all Multi-Layer wells in the model.
+        Each well is queried once per attribute; coordinates are taken from the mesh topology.
+        The screen of a well comprises all nodes between top and bottom node (for layered meshes,
+        otherwise only the top and bottom node).
 
         :return: dictionary
         :rtype: dict
         """
 
-        if global_cos:
-            X0, Y0 = self.doc.getOriginX(), self.doc.getOriginY()
-        else:
-            X0, Y0 = 0, 0
+        topology = self.topology()
+        x, y, z = topology.coordinates(global_cos=global_cos)
 
         l_mlw = range(self.doc.getNumberOfMultiLayerWells())
+        bottom = np.array([self.doc.getMultiLayerWellBottomNode(mlw) for mlw in l_mlw], dtype=np.int64)
+        top = np.array([self.doc.getMultiLayerWellTopNode(mlw) for mlw in l_mlw], dtype=np.int64)
+        infos = [self.doc.queryMultiLayerWellInfo(int(node)) for node in bottom]
+
+        if topology.is_layered:
+            nps = topology.nodes_per_slice
+            screens = [np.arange(min(t, b), max(t, b) + 1, nps) for t, b in zip(top, bottom)]
+        else:
+            screens = [np.unique([t, b]) for t, b in zip(top, bottom)]
+
         data = {
-            "name": [self.doc.queryMultiLayerWellInfo(self.doc.getMultiLayerWellBottomNode(mlw)).getName() for mlw in l_mlw],
-            "radius": [self.doc.queryMultiLayerWellInfo(self.doc.getMultiLayerWellBottomNode(mlw)).getRadius() for mlw in l_mlw],
-            "mlw_id": [self.doc.queryMultiLayerWellInfo(self.doc.getMultiLayerWellBottomNode(mlw)).getId() for mlw in l_mlw],
+            "name": [info.getName() for info in infos],
+            "radius": [info.getRadius() for info in infos],
+            "mlw_id": [info.getId() for info in infos],
             "rate_tsid": [self.doc.getMultiLayerWellAttrTSID(mlw, Enum.MLW_RATE) for mlw in l_mlw],
             "rate_value": [self.doc.getMultiLayerWellAttrValue(mlw, Enum.MLW_RATE) for mlw in l_mlw],
             "bcc_hmin_tsid": [self.doc.getMultiLayerWellAttrTSID(mlw, Enum.MLW_BCC_HMIN) for mlw in l_mlw],
             "bcc_hmin_value": [self.doc.getMultiLayerWellAttrValue(mlw, Enum.MLW_BCC_HMIN) for mlw in l_mlw],
             "bcc_hmax_tsid": [self.doc.getMultiLayerWellAttrTSID(mlw, Enum.MLW_BCC_HMAX) for mlw in l_mlw],
             "bcc_hmax_value": [self.doc.getMultiLayerWellAttrValue(mlw, Enum.MLW_BCC_HMAX) for mlw in l_mlw],
-            "bottom_node": [self.doc.getMultiLayerWellBottomNode(mlw) for mlw in l_mlw],
-            "top_node": [self.doc.getMultiLayerWellTopNode(mlw) for mlw in l_mlw],
-            "top_x": [self.doc.getX(self.doc.getMultiLayerWellTopNode(mlw)) + X0 for mlw in l_mlw],
-            "top_y": [self.doc.getY(self.doc.getMultiLayerWellTopNode(mlw)) + Y0 for mlw in l_mlw],
-            "top_z": [self.doc.getZ(self.doc.getMultiLayerWellTopNode(mlw)) for mlw in l_mlw],
-            "bottom_x": [self.doc.getX(self.doc.getMultiLayerWellBottomNode(mlw)) + X0 for mlw in l_mlw],
-            "bottom_y": [self.doc.getY(self.doc.getMultiLayerWellBottomNode(mlw)) + Y0 for mlw in l_mlw],
-            "bottom_z": [self.doc.getZ(self.doc.getMultiLayerWellBottomNode(mlw)) for mlw in l_mlw],
+            "bottom_node": bottom.tolist(),
+            "top_node": top.tolist(),
+            "top_x": x[top].tolist(),
+            "top_y": y[top].tolist(),
+            "top_z": z[top].tolist(),
+            "bottom_x": x[bottom].tolist(),
+            "bottom_y": y[bottom].tolist(),
+            "bottom_z": z[bottom].tolist(),
+            "screen_nodes": [screen.tolist() for screen in screens],
+            "screen_x": [x[screen].tolist() for screen in screens],
+            "screen_y": [y[screen].tolist() for screen in screens],
+            "screen_z": [z[screen].tolist() for screen in screens],
         }
         return data
+
+    def mlw_snapshot(self, wells=None):
+        """
+        Return the current rate and the nodal heads of all Multi-Layer wells at once, e.g. to record well
+        results in every time step of a simulation.
+
+        :param wells: result of mlw() to reuse the well structure (screen nodes) across time steps.
+                      If None, it is extracted again.
+        :type wells:  dict or None
+        :return:      dictionary with numpy arrays (one entry per well)
+        :rtype:       dict
+        """
+        if wells is None:
+            wells = self.mlw()
+
+        l_mlw = range(len(wells["mlw_id"]))
+        head = self._item_values("NODAL", par=Enum.P_HEAD)
+
+        screens = wells["screen_nodes"]
+        lengths = np.array([len(screen) for screen in screens], dtype=np.int64)
+        screen_head = head[np.concatenate(screens).astype(np.int64)] if len(screens) > 0 else np.zeros(0)
+        starts = np.cumsum(lengths) - lengths
+
+        return {
+            "mlw_id": np.asarray(wells["mlw_id"]),
+            "simulation_time": self.doc.getAbsoluteSimulationTime(),
+            "rate_value": np.array([self.doc.getMultiLayerWellAttrValue(mlw, Enum.MLW_RATE) for mlw in l_mlw]),
+            "head_top": head[np.asarray(wells["top_node"], dtype=np.int64)],
+            "head_bottom": head[np.asarray(wells["bottom_node"], dtype=np.int64)],
+            "head_mean": np.add.reduceat(screen_head, starts) / lengths if len(screens) > 0 else np.zeros(0),
+        }
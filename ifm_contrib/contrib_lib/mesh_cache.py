@@ -0,0 +1,84 @@
+import hashlib
+import json
+import os
+import shutil
+
+import numpy as np
+
+
+class MeshCache:
+    """
+    On-disk cache of mesh arrays extracted from a model file. Each array is stored as .npy file in a folder
+    named by the fingerprint of the model file (path, size, modification time and content hash) and is
+    memory-mapped when loaded.
+    """
+
+    def __init__(self, cache_dir, filename):
+        """
+        :param cache_dir: folder to store cached arrays in (created if missing)
+        :type cache_dir:  str
+        :param filename:  path of the model file (fem or dac)
+        :type filename:   str
+        """
+        self.cache_dir = os.path.abspath(cache_dir)
+        self.filename = os.path.abspath(filename)
+        self.key = MeshCache.get_key(self.filename)
+        self.path = os.path.join(self.cache_dir, "{}-{}".format(os.path.basename(self.filename), self.key))
+
+    @staticmethod
+    def get_key(filename, blocksize=2 ** 20):
+        """
+        Return the fingerprint of a file, computed from path, size, modification time and content hash.
+        """
+        stat = os.stat(filename)
+        content = hashlib.sha1()
+        with open(filename, "rb") as f:
+            for block in iter(lambda: f.read(blocksize), b""):
+                content.update(block)
+        key = "|".join([filename, str(stat.st_size), str(stat.st_mtime_ns), content.hexdigest()])
+        return hashlib.sha1(key.encode("utf-8")).hexdigest()[:16]
+
+    def exists(self, group):
+        """
+        Return True if the given group of arrays (e.g. "topology") is cached.
+        """
+        return os.path.isfile(os.path.join(self.path, group, "meta.json"))
+
+    def load(self, group):
+        """
+        Return the arrays of the given group as dict {name: numpy.ndarray} (memory-mapped, read-only) or None if the
+        group is not cached.
+        """
+        if not self.exists(group):
+            return None
+
+        folder = os.path.join(self.path, group)
+        with open(os.path.join(folder, "meta.json")) as f:
+            meta = json.load(f)
+        return {name: np.load(os.path.join(folder, name + ".npy"), mmap_mode="r") for name in meta["arrays"]}
+
+    def save(self, group, arrays):
+        """
+        Store a group of arrays given as dict {name: numpy.ndarray}. The group is written to a temporary folder
+        first and renamed when complete, so parallel workers never see partial groups.
+        """
+        folder = os.path.join(self.path, group)
+        tmp_folder = "{}.tmp{}".format(folder, os.getpid())
+        os.makedirs(tmp_folder, exist_ok=True)
+
+        for name, array in arrays.items():
+            np.save(os.path.join(tmp_folder, name + ".npy"), np.asarray(array))
+        with open(os.path.join(tmp_folder, "meta.json"), "w") as f:
+            json.dump({"filename": self.filename, "arrays": list(arrays)}, f)
+
+        try:
+            os.rename(tmp_folder, folder)
+        except OSError:
+            # another process was faster
+            shutil.rmtree(tmp_folder, ignore_errors=True)
+
+    def clear(self):
+        """
+        Remove all cached arrays of this model file.
+        """
+        shutil.rmtree(self.path, ignore_errors=True)
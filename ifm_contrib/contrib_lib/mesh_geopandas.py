@@ -9,11 +9,65 @@ class MeshGpd:
     def __init__(self, doc):
         self.doc = doc
 
+    def _points(self, x, y, nodes=None):
+        """
+        Return shapely Points created in bulk from coordinate arrays. In 3D models, the elevation of the given nodes is
+        added as z coordinate.
+
+        :param x:     x coordinates
+        :type x:      numpy.ndarray
+        :param y:     y coordinates
+        :type y:      numpy.ndarray
+        :param nodes: node numbers of the points (for the z coordinate in 3D models)
+        :type nodes:  numpy.ndarray or None
+        :return:      numpy.ndarray of shapely.Point
+        """
+        import shapely
+        import numpy as np
+
+        x = np.asarray(x, dtype=np.float64)
+        y = np.asarray(y, dtype=np.float64)
+        if nodes is not None and self.doc.getNumberOfDimensions() == 3:
+            z = self.doc.c.mesh.topology().z[np.asarray(nodes, dtype=np.int64)]
+            return shapely.points(x, y, z)
+        return shapely.points(x, y)
+
+    def _polygons(self, elements, global_cos=True, top_only=False):
+        """
+        Return the polygons of the given elements as numpy array of shapely geometries. The polygons are created in
+        bulk from the coordinate and incidence arrays, grouped by the number of element nodes.
+
+        :param elements:   element numbers
+        :type elements:    numpy.ndarray
+        :param global_cos: If True (default), use global instead of local coordinate system.
+        :type global_cos:  bool
+        :param top_only:   If True, use only the first half of the element nodes (top face of 3D elements).
+        :type top_only:    bool
+        :return:           numpy.ndarray of shapely.Polygon
+        """
+        import shapely
+        import numpy as np
+
+        topology = self.doc.c.mesh.topology()
+        x, y, _ = topology.coordinates(global_cos=global_cos)
+        nn = topology.nn[elements]
+
+        polygons = np.empty(len(elements), dtype=object)
+        for NN in np.unique(nn):
+            position = np.flatnonzero(nn == NN)
+            n_nodes = int(NN) // 2 if top_only else int(NN)
+            nodes = topology.nodes[topology.offsets[elements[position]][:, None] + np.arange(n_nodes)[None, :]]
+            polygons[position] = shapely.polygons(np.stack([x[nodes], y[nodes]], axis=-1))
+        return polygons
+
     def elements(self, par=None, expr=None, distr=None, global_cos=True, layer=None, selection=None, as_2d=False,
-                 content=None, polygons_as_2d=False):
+                 content=None, polygons_as_2d=False, stacked=False):
         """
         Create a GeoPandas GeoDataframe with information on the model elements.
 
+        In layered 3D models, the 2D polygons (as_2d, polygons_as_2d or layer) are built once for the first layer and
+        the same geometry objects are shared by the elements of all layers.
+
         :param par:        Create additional columns with parameter values. Parameter are provided as ifm.Enum. Multiple
                            columns are created if a list is provided.  Columns can be givens custom names if a dict
                            {column name : parid} is provided.
@@ -26,43 +80,110 @@ class MeshGpd:
         :type expr:        str or list
         :param global_cos: If True (default), use global instead of local coordinate system.
         :type global_cos:  bool
-        :param layer:      if provided in a 3D model, return only elements of this layer
-        :type layer:       int
-        :param selection:  if provided in a 3D model, return only elements of this selection
-        :type selection:   str
+        :param layer:      if provided in a 3D model, return only elements of this layer (or list of layers)
+        :type layer:       int or list
+        :param selection:  if provided, return only elements of this selection (name or list of element numbers). In
+                           the wide as_2d frame, footprint elements selected in any of the layers are returned.
+        :type selection:   str or list
+        :param as_2d:      if True in a layered 3D model, return one row per element of the 2D footprint. Values of
+                           several layers are added as columns with the layer number as suffix (e.g. "P_CONDX_2";
+                           parameters given as ifm.Enum are named after their constant, other items by name or id).
+        :type as_2d:       bool
+        :param stacked:    if True together with as_2d, return the long layer-stacked frame instead: one row per
+                           element of all (or the given) layers, sharing the footprint geometry.
+        :type stacked:     bool
+        :param polygons_as_2d: if True in a 3D model, use the top face of each element as polygon.
+        :type polygons_as_2d:  bool
         :return:           geopandas.GeoDataFrame
         """
 
         import geopandas as gpd
-        from shapely.geometry import Polygon
         import numpy as np
 
-        imat = self.doc.c.mesh.imatrix_as_array(global_cos=global_cos,
-                                                split_quads_to_triangles=False,
-                                                layer=layer,
-                                                as_2d=as_2d)
-        if global_cos:
-            X0, Y0 = self.doc.getOriginX(), self.doc.getOriginY()
-            x = [X + X0 for X in self.doc.getParamValues(Enum.P_MSH_X)]
-            y = [Y + Y0 for Y in self.doc.getParamValues(Enum.P_MSH_Y)]
+        ee = self.doc.getNumberOfElementsPerLayer()
+        layers = [layer] if type(layer) == int else layer
+        layered = self.doc.getNumberOfDimensions() == 3 and self.doc.getNumberOfLayers() != -1
+
+        if layered and (as_2d or polygons_as_2d or layers is not None):
+            # 2D footprint, built once for the first layer and shared by all layers
+            footprint = self._polygons(np.arange(ee), global_cos, top_only=True)
+            if layers is None:
+                layers = list(range(1, self.doc.getNumberOfLayers() + 1))
+            layer_elements = [np.arange(ee) + (lay - 1) * ee for lay in layers]
+            if as_2d and not stacked:
+                # wide frame: one row per footprint element
+                rows = np.arange(ee)
+                geometries = footprint
+            else:
+                # long frame: one row per element, referencing the footprint geometry
+                rows = np.concatenate(layer_elements)
+                geometries = footprint[rows % ee]
+                layer_elements = [rows]
         else:
-            x = self.doc.getParamValues(Enum.P_MSH_X)
-            y = self.doc.getParamValues(Enum.P_MSH_Y)
+            rows = np.arange(self.doc.getNumberOfElements())
+            geometries = self._polygons(rows, global_cos, top_only=polygons_as_2d)
+            layer_elements = [rows]
 
         # create a GeoDataFrame from the mesh
-        if polygons_as_2d:
-            gdf_elements = gpd.GeoDataFrame([Polygon([(x[n], y[n]) for n in element[:len(element)//2]]) for element in imat])
-        else:
-            gdf_elements = gpd.GeoDataFrame([Polygon([(x[n], y[n]) for n in element]) for element in imat])
-
-        gdf_elements.columns = ["element_shape"]
+        gdf_elements = gpd.GeoDataFrame({"element_shape": geometries}, index=rows)
         gdf_elements.set_geometry("element_shape", inplace=True)
         gdf_elements.index.name = "ELEMENT"
         gdf_elements["ELEMENT"] = gdf_elements.index.values
-        gdf_elements["LAYER"] = gdf_elements.index.values // self.doc.getNumberOfElementsPerLayer() + 1
-        gdf_elements["TOP_ELEMENT"] = gdf_elements.index.values % self.doc.getNumberOfElementsPerLayer()
+        if len(layer_elements) == 1:
+            gdf_elements["LAYER"] = layer_elements[0] // ee + 1
+            gdf_elements["TOP_ELEMENT"] = layer_elements[0] % ee
+        else:
+            gdf_elements["TOP_ELEMENT"] = gdf_elements.index.values
         gdf_elements["AREA"] = gdf_elements.geometry.area
 
+        # add attributes, with layer suffix if several layers are attached to the footprint
+        if len(layer_elements) == 1:
+            suffixes = [""]
+        else:
+            suffixes = ["_{}".format(lay) for lay in layers]
+        self._add_element_values(gdf_elements, layer_elements, suffixes, par=par, expr=expr, distr=distr,
+                                 content=content)
+
+        # filter by given selection
+        if selection is not None:
+            if type(selection) == str:
+                sele = np.fromiter(self.doc.c.sel.set(selection), dtype=np.int64)
+            else:
+                sele = np.asarray(selection, dtype=np.int64)
+            if len(layer_elements) > 1:
+                # wide frame: keep footprint elements selected in any of the layers
+                sele = sele[np.isin(sele // ee + 1, layers)] % ee
+            gdf_elements = gdf_elements.loc[np.intersect1d(sele, gdf_elements.index.values)]
+
+        # filter by layer (models without layered footprint)
+        if layers is not None and len(layer_elements) == 1:
+            gdf_elements = gdf_elements.loc[gdf_elements.LAYER.isin(layers)]
+
+        # set a coordinate system if defined for the model
+        if self.doc.c.crs is not None:
+            gdf_elements.crs = self.doc.c.crs
+
+        return gdf_elements
+
+    def _add_element_values(self, gdf_elements, layer_elements, suffixes, par=None, expr=None, distr=None,
+                            content=None):
+        """
+        Add parameter, expression, distribution and content columns to the frame. Each item is fetched from the kernel
+        once; for each array of element numbers in layer_elements (one element per row), columns with the
+        corresponding suffix are added.
+        """
+        import numpy as np
+
+        needed = np.concatenate(layer_elements)
+        splits = np.cumsum([len(elements) for elements in layer_elements])[:-1]
+
+        def add(key, values, model_wide=True, name=None):
+            # values of all elements (model_wide) or of the needed elements; suffixed columns are named after name
+            values = np.asarray(values)
+            parts = [values[elements] for elements in layer_elements] if model_wide else np.split(values, splits)
+            for suffix, part in zip(suffixes, parts):
+                gdf_elements[key if suffix == "" else "{}{}".format(key if name is None else name, suffix)] = part
+
         if par is not None:
             # single items become lists
             if type(par) == int:
@@ -70,29 +191,19 @@ class MeshGpd:
 
             # export parameters if provided
             if type(par) == list:
-                for parameter_id in par:
-                    self.doc.getParamSize(parameter_id)
-                    gdf_elements[parameter_id] = self.doc.getParamValues(parameter_id)
-
-            if type(par) == dict:
-                for key in par:
-                    self.doc.getParamSize(par[key])
-                    gdf_elements[key] = self.doc.getParamValues(par[key])
+                par = {parameter_id: parameter_id for parameter_id in par}
+            for key in par:
+                self.doc.getParamSize(par[key])
+                name = self.doc.c.mesh.parameter_name(key) if type(key) == int else key
+                add(key, self.doc.getParamValues(par[key]), name=name)
 
         if expr is not None:
             # single items become lists
-            if type(expr) == str:
+            if type(expr) in [str, int]:
                 expr = [expr]
 
             for x in expr:
-                if type(x) == str:
-                    exprID = self.doc.getElementalExprDistrIdByName(x)
-                elif type(x) == int:
-                    exprID = x
-                else:
-                    raise ValueError("expr must be string (for name) or integer (for id)")
-                gdf_elements[x] = [self.doc.getElementalExprDistrValue(exprID, n) for n in
-                                   range(self.doc.getNumberOfElements())]
+                add(x, self.doc.c.user.expr_values(x, item_type="ELEMENTAL", items=needed), model_wide=False)
 
         if distr is not None:
             # single items become lists
@@ -106,30 +217,7 @@ class MeshGpd:
                     distrID = d
                 else:
                     raise ValueError("expr distr be string (for name) or integer (for id)")
-                if layer is None:
-                    values = self.doc.getElementalRefDistrValues(distrID)
-                else:
-                    ee = self.doc.getNumberOfElementsPerLayer()
-                    values = self.doc.getElementalRefDistrValues(distrID)[ee*(layer-1):ee*layer]
-                gdf_elements[d] = values
-
-        # filter by given selection
-        if selection is not None:
-            sele = self.doc.c.sel.set(selection)
-            sele = sele.intersection(set(gdf_elements.index))
-            gdf_elements = gdf_elements.iloc[list(sele)]
-
-        # filter
-        if layer is not None:
-            # if only single layer requested, create list with one element
-            if type(layer) == int:
-                layer = [layer]
-            # filter by layer list
-            gdf_elements = gdf_elements.loc[gdf_elements.LAYER.isin(layer)]
-
-        # set a coordinate system if defined for the model
-        if self.doc.c.crs is not None:
-            gdf_elements.crs = self.doc.c.crs
+                add(d, self.doc.getElementalRefDistrValues(distrID))
 
         # add elemental content
         if content is not None and content is not False:
@@ -143,14 +231,7 @@ class MeshGpd:
                 raise ValueError("content must be None, False, True, int or list[int]")
 
             for i, row in self.doc.c.content.df.info().loc[items].iterrows():
-                name = row["ifm.Enum"]
-                try:
-                    gdf_elements[name] = [self.doc.getElementalContent(i, e) for e in gdf_elements.index]
-                except RuntimeError:
-                    gdf_elements[name] = np.nan
-
-
-        return gdf_elements
+                add(row["ifm.Enum"], self.doc.c.content.values(i, items=needed), model_wide=False)
 
     def nodes(self, *args, **kwargs):
         """
@@ -175,11 +256,10 @@ class MeshGpd:
         :return:           geopandas.GeoDataFrame
         """
 
-        from shapely.geometry import Point
         import geopandas as gpd  # required, this integrates the df.set_geometry function in pandas.DataFrame
 
         df_nodes = self.doc.c.mesh.df.nodes(*args, **kwargs)
-        df_nodes["element_shape"] = [Point(row.X, row.Y) for (i, row) in df_nodes.iterrows()]
+        df_nodes["element_shape"] = self._points(df_nodes.X.values, df_nodes.Y.values, df_nodes.index.values)
 
         gdf_nodes = df_nodes.set_geometry("element_shape")
 
@@ -190,10 +270,10 @@ class MeshGpd:
         return gdf_nodes
 
     def border_nodes(self, border_number=0, *args, **kwargs):
-        from shapely.geometry import Point
         import geopandas as gpd
-        gdf_border = gpd.GeoDataFrame(self.doc.c.mesh.df.border_nodes(border_number, *args, **kwargs))
-        gdf_border["geometry"] = gdf_border.apply(lambda x: Point(x.X, x.Y), axis=1)
+        df_border = self.doc.c.mesh.df.border_nodes(border_number, *args, **kwargs)
+        gdf_border = gpd.GeoDataFrame(df_border, geometry=self._points(df_border.X.values, df_border.Y.values,
+                                                                       df_border.NODE.values))
         return gdf_border
 
     def borders(self):
@@ -204,13 +284,14 @@ class MeshGpd:
         :rtype: shapely.geometry.LinearRing
         """
         import geopandas as gpd
+        import numpy as np
         from shapely.geometry import LinearRing
 
         borders = self.doc.c.mesh.get_borders()
         shapes = []
         for border in self.doc.c.mesh.get_borders():
-            gdf_nodes = self.doc.c.mesh.gdf.nodes(selection=borders[border])
-            outline = LinearRing(list(gdf_nodes.element_shape))
+            df_nodes = self.doc.c.mesh.df.nodes(selection=borders[border])
+            outline = LinearRing(np.column_stack([df_nodes.X.values, df_nodes.Y.values]))
             shapes.append(outline)
 
         # create GeoDataFrame
@@ -230,25 +311,67 @@ class MeshGpd:
         return gdf_borders
 
 
+    def _outline_polygons(self, elements=None, global_cos=True):
+        """
+        Return the outline of the given elements as a list of polygons (with holes), traced from the mesh topology
+        (see MeshTopology.outline).
+
+        :param elements:   element numbers (default: all elements)
+        :type elements:    array-like or None
+        :param global_cos: If True (default), use global instead of local coordinate system.
+        :type global_cos:  bool
+        :return:           list of shapely.Polygon
+        """
+        import shapely
+        import numpy as np
+
+        topology = self.doc.c.mesh.topology()
+        x, y, _ = topology.coordinates(global_cos=global_cos)
+        rings, exterior = topology.outline(elements)
+
+        coords = [np.column_stack([x[ring], y[ring]]) for ring in rings]
+        shells = [c for c, is_exterior in zip(coords, exterior) if is_exterior]
+        holes = [c for c, is_exterior in zip(coords, exterior) if not is_exterior]
+        shell_polygons = np.empty(len(shells), dtype=object)
+        shell_polygons[:] = [shapely.Polygon(shell) for shell in shells]
+
+        # assign each hole to the smallest shell covering the midpoint of its first edge
+        shell_holes = [[] for _ in shells]
+        if holes:
+            midpoints = shapely.points([(c[0] + c[1]) / 2. for c in holes])
+            hole_index, shell_index = shapely.STRtree(shell_polygons).query(midpoints, predicate="covered_by")
+            areas = shapely.area(shell_polygons)
+            for h in range(len(holes)):
+                candidates = shell_index[hole_index == h]
+                if len(candidates) > 0:
+                    shell_holes[candidates[np.argmin(areas[candidates])]].append(holes[h])
+
+        return [shapely.Polygon(shell, shell_holes[s]) for s, shell in enumerate(shells)]
+
     def model_area(self, selection=None):
         """
         Get the model area as a single 2D polygon.
 
-        :param selection:  if provided, return model area related to this elemental selection.
-        :type selection: str
+        With a selection, the outline is traced from the mesh topology: boundary edges of the selected elements are
+        chained into rings and assembled into polygons with holes. In layered 3D models, the footprint of the selected
+        elements of all layers is used.
+
+        :param selection:  if provided, return model area related to this elemental selection (name or list of element
+                           numbers).
+        :type selection: str or list
 
         :return: geopandas.GeoDataFrame.
         """
         import geopandas as gpd
-        from shapely.geometry import Polygon
+        from shapely.geometry import Polygon, MultiPolygon
 
         if selection is None:
             # Create a GeoDataFrame of Model area based on Border Nodes API.
             # This is generally fast but does not allow to create the polygons based on selections.
 
             # create areas from outer borders:
-            gdf_borders = self.doc.c.mesh.gdf.model_borders()
-            holes = gdf_borders[gdf_borders.is_interior].geometry
+            gdf_borders = self.doc.c.mesh.gdf.borders()
+            holes = list(gdf_borders[gdf_borders.is_interior].geometry)
 
             areas = [Polygon(shell=row.geometry, holes=holes) for i, row in
                      gdf_borders[gdf_borders.is_exterior].iterrows()]
@@ -261,17 +384,20 @@ class MeshGpd:
             gdf_areas["AREA"] = gdf_areas.geometry.area
 
         else:
-            if self.doc.pdoc.findSelection(Enum.SEL_ELEMENTAL, selection) == -1:
-                raise ValueError("Elemental Selection {} does not exist".format(selection))
-
-            gdf_areas = self.doc.c.mesh.gdf.elements(layer=1, as_2d=True, selection=selection)
-            gdf_areas["dummy"] = 0
-            gdf_areas = gdf_areas.dissolve(by="dummy")
-            gdf_areas.reset_index(inplace=True)
-            del (gdf_areas["ELEMENT"])
-            del (gdf_areas["LAYER"])
-            del (gdf_areas["TOP_ELEMENT"])
-            del (gdf_areas["dummy"])
+            if type(selection) == str:
+                if self.doc.pdoc.findSelection(Enum.SEL_ELEMENTAL, selection) == -1:
+                    raise ValueError("Elemental Selection {} does not exist".format(selection))
+                selection = self.doc.c.sel.list(selection, seltype=Enum.SEL_ELEMS)
+
+            polygons = self._outline_polygons(selection)
+            if len(polygons) == 0:
+                areas = []
+            elif len(polygons) == 1:
+                areas = polygons
+            else:
+                areas = [MultiPolygon(polygons)]
+
+            gdf_areas = gpd.GeoDataFrame(geometry=areas)
             gdf_areas["AREA"] = gdf_areas.geometry.area
 
         # set a coordinate system if defined for the model
@@ -285,7 +411,7 @@ class MeshGpd:
         Return a geoPandas.GeoDataFrame with information on all Multi-Layer wells in the model.
         :return:
         """
-        from shapely.geometry import Point
+        import shapely
         import geopandas as gpd
         gdf = gpd.GeoDataFrame(self.doc.c.mesh.df.mlw(global_cos=global_cos))
 
@@ -293,36 +419,41 @@ class MeshGpd:
         if self.doc.c.crs is not None:
             gdf.crs = self.doc.c.crs
 
-        gdf["element_shape"] = [Point(row.bottom_x, row.bottom_y) for (i, row) in gdf.iterrows()]
+        gdf["element_shape"] = shapely.points(gdf.bottom_x.values.astype(float), gdf.bottom_y.values.astype(float),
+                                              gdf.bottom_z.values.astype(float))
         return gdf.set_geometry("element_shape")
 
     def dfe(self):
         """
-        Return a geoPandas.GeoDataFrame with information on all DFE in the model.
+        Return a geoPandas.GeoDataFrame with information on all DFE in the model. 1D fractures are represented as
+        LineStrings, 2D fractures as Polygons (3D coordinates in 3D models).
         :return:
         """
-        if self.doc.getNumberOfDimensions() != 3:
-            raise NotImplementedError("this function is currently only available for 3D problems")
-
-        from shapely.geometry import LineString
+        import shapely
         import geopandas as gpd
         import numpy as np
 
         gdf = gpd.GeoDataFrame(self.doc.c.mesh.df.dfe())
+        incidence = gdf[[c for c in gdf.columns if c.startswith("node_")]].values
+        n_nodes = (incidence >= 0).sum(axis=1)
 
-        # get coordinates of nodes
-        df_nodes = self.doc.c.mesh.df.nodes(par={"Z": Enum.P_ELEV})
-        gdf["x1"] = np.array(df_nodes.loc[gdf.node_1].X)
-        gdf["x2"] = np.array(df_nodes.loc[gdf.node_2].X)
-        gdf["y1"] = np.array(df_nodes.loc[gdf.node_1].Y)
-        gdf["y2"] = np.array(df_nodes.loc[gdf.node_2].Y)
-        gdf["z1"] = np.array(df_nodes.loc[gdf.node_1].Z)
-        gdf["z2"] = np.array(df_nodes.loc[gdf.node_2].Z)
-
-        gdf["element_shape"] = [LineString([(row.x1, row.y1, row.z1),
-                                            (row.x2, row.y2, row.z2)]) for (i, row) in gdf.iterrows()]
-
-        gdf.drop(columns=["x1", "x2", "y1", "y2", "z1", "z2"], inplace=True)
+        # node coordinates
+        x, y, z = self.doc.c.mesh.topology().coordinates(global_cos=True)
+        if self.doc.getNumberOfDimensions() == 3:
+            xyz = np.column_stack([x, y, z])
+        else:
+            xyz = np.column_stack([x, y])
+
+        # create geometries by number of fracture nodes
+        geometries = np.empty(len(gdf), dtype=object)
+        for n in np.unique(n_nodes):
+            fracs = np.flatnonzero(n_nodes == n)
+            coords = xyz[incidence[fracs, :n]]
+            if n == 2:
+                geometries[fracs] = shapely.linestrings(coords)
+            else:
+                geometries[fracs] = shapely.polygons(coords)
+        gdf["element_shape"] = geometries
 
         # set a coordinate system if defined for the model
         if self.doc.c.crs is not None:
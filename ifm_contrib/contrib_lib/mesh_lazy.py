@@ -0,0 +1,235 @@
+import numpy as np
+from ifm import Enum
+
+
+class LazyMeshFrame:
+    """
+    Frame-like view on the nodes or elements of a model, returned by doc.c.mesh.df.nodes(lazy=True) and
+    doc.c.mesh.df.elements(lazy=True). The available columns (parameters, aux items, user distributions and
+    expressions) are known in advance, but values are fetched from the kernel only when a column is accessed
+    first. Fetched columns are kept until the simulation time or the mesh changes, or doc.c.mesh.values_changed()
+    is called (done by doc.c.sim.start() and doc.c.user.create()). Values written directly to the kernel (e.g.
+    doc.setParamValues(), a run with doc.startSimulator() ending at the same time, or switching the species) are not
+    detected, call clear() or doc.c.mesh.values_changed() in these cases.
+
+    Columns are accessed like in a DataFrame, e.g. frame["P_HEAD"], frame[Enum.P_HEAD], frame.P_HEAD or
+    frame[["X", "Y", "P_HEAD"]]. Use to_frame() to materialize a pandas.DataFrame.
+    """
+
+    def __init__(self, doc, item_type, index=None, global_cos=True):
+        """
+        :param doc:        FEFLOW document
+        :param item_type:  "NODAL" or "ELEMENTAL"
+        :type item_type:   str
+        :param index:      node or element numbers of the rows (default: all items)
+        :type index:       numpy.ndarray or None
+        :param global_cos: if True (default), use global instead of local coordinate system
+        :type global_cos:  bool
+        """
+        if item_type not in ["NODAL", "ELEMENTAL"]:
+            raise ValueError("item_type must be 'NODAL' or 'ELEMENTAL'")
+
+        self.doc = doc
+        self.item_type = item_type
+        self.global_cos = global_cos
+        self._index = index
+        self._catalog = None
+        self._columns = {}
+        self._state = None
+
+    def _n_items(self):
+        if self.item_type == "NODAL":
+            return self.doc.getNumberOfNodes()
+        return self.doc.getNumberOfElements()
+
+    @property
+    def index(self):
+        """
+        Node or element numbers of the rows as pandas.Index.
+        """
+        import pandas as pd
+
+        index = np.arange(self._n_items()) if self._index is None else self._index
+        return pd.Index(index, name="NODE" if self.item_type == "NODAL" else "ELEMENT")
+
+    def __len__(self):
+        return self._n_items() if self._index is None else len(self._index)
+
+    def _base_columns(self):
+        # slice and layer numbers are available for layered meshes only
+        if self.item_type == "NODAL":
+            if self.doc.getNumberOfNodesPerElement() == 0:
+                return ["X", "Y"]
+            return ["SLICE", "TOP_NODE", "X", "Y"]
+        if self.doc.getNumberOfLayers() == -1:
+            return []
+        return ["LAYER", "TOP_ELEMENT"]
+
+    @property
+    def catalog(self):
+        """
+        Dictionary {column name: (kind, key)} of all available columns. kind is one of "base", "par", "aux",
+        "distr" and "expr". Built on first access.
+        """
+        if self._catalog is None:
+            nodal = self.item_type == "NODAL"
+            catalog = {name: ("base", name) for name in self._base_columns()}
+
+            # parameters and aux items
+            df_items = self.doc.c.mesh.parameter_catalog()
+            df_items = df_items[df_items.Type.isin(["nodal" if nodal else "elemental", "ambiguous"]) &
+                                df_items.Available]
+            for name, row in df_items.iterrows():
+                catalog[name] = ("aux", name) if row.Aux else ("par", int(row.Enum_Constant))
+
+            # user distributions and expressions
+            if nodal:
+                n_distr, get_distr = self.doc.pdoc.getNumberOfNodalRefDistr(), self.doc.getNodalRefDistrName
+                n_expr, get_expr = self.doc.pdoc.getNumberOfNodalExprDistr(), self.doc.getNodalExprDistrName
+            else:
+                n_distr, get_distr = self.doc.pdoc.getNumberOfElementalRefDistr(), self.doc.getElementalRefDistrName
+                n_expr, get_expr = self.doc.pdoc.getNumberOfElementalExprDistr(), self.doc.getElementalExprDistrName
+            for i in range(n_distr):
+                catalog[get_distr(i)] = ("distr", i)
+            for i in range(n_expr):
+                catalog[get_expr(i)] = ("expr", i)
+
+            self._catalog = catalog
+
+        return self._catalog
+
+    @property
+    def columns(self):
+        """
+        List of all available column names.
+        """
+        return list(self.catalog)
+
+    @property
+    def cached(self):
+        """
+        List of the columns fetched so far (and still valid).
+        """
+        self._check_state()
+        return list(self._columns)
+
+    def __contains__(self, name):
+        return name in self.catalog or self._par_name(name) is not None
+
+    def _par_name(self, name):
+        # parameters can also be addressed by their ifm.Enum value
+        if isinstance(name, (int, np.integer)) and not isinstance(name, bool):
+            for key, (kind, par_id) in self.catalog.items():
+                if kind == "par" and par_id == name:
+                    return key
+        return None
+
+    def _check_state(self):
+        """
+        Discard fetched columns if the simulation time, the mesh or values (see doc.c.mesh.values_changed()) have
+        changed.
+        """
+        from .mesh_topology import MeshTopology
+
+        state = (self.doc.getAbsoluteSimulationTime(), MeshTopology.get_fingerprint(self.doc),
+                 self.doc.c.mesh.values_version)
+        if state != self._state:
+            if self._state is not None and state[1:] != self._state[1:]:
+                self._catalog = None
+            self._columns = {}
+            self._state = state
+
+    def clear(self):
+        """
+        Discard all fetched columns.
+        """
+        self._columns = {}
+
+    def _fetch(self, name):
+        kind, key = self.catalog[name]
+        index = self._index
+        take = self.doc.c.mesh.df._take
+        nodal = self.item_type == "NODAL"
+        items = np.arange(self._n_items()) if index is None else index
+
+        if kind == "base":
+            if key == "SLICE":
+                values = items // self.doc.getNumberOfNodesPerSlice() + 1
+            elif key == "TOP_NODE":
+                values = items % self.doc.getNumberOfNodesPerSlice()
+            elif key == "LAYER":
+                values = items // self.doc.getNumberOfElementsPerLayer() + 1
+            elif key == "TOP_ELEMENT":
+                values = items % self.doc.getNumberOfElementsPerLayer()
+            else:
+                par, origin = (Enum.P_MSH_X, self.doc.getOriginX()) if key == "X" else \
+                              (Enum.P_MSH_Y, self.doc.getOriginY())
+                values = take(self.doc.getParamValues(par), index) + (origin if self.global_cos else 0.)
+            return values
+        elif kind == "par":
+            self.doc.getParamSize(key)
+            values = take(self.doc.getParamValues(key), index)
+        elif kind == "aux":
+            p = self.doc.getParameter(Enum.P_AUXDIST_N if nodal else Enum.P_AUXDIST_E, str(key))
+            values = take(self.doc.getParamValues(p), index)
+        elif kind == "distr":
+            get_values = self.doc.getNodalRefDistrValues if nodal else self.doc.getElementalRefDistrValues
+            values = take(get_values(key), index)
+        else:
+            values = self.doc.c.user.expr_values(key, item_type=self.item_type, items=index)
+
+        values = np.array(values, dtype=np.float64)
+        values[values == -99999.0] = np.nan
+        return values
+
+    def values(self, name):
+        """
+        Return the values of a column as numpy.ndarray, fetching them from the kernel if required.
+
+        :param name: column name or ifm.Enum of a parameter
+        :type name:  str or int
+        :return:     numpy.ndarray
+        """
+        self._check_state()
+        if name not in self.catalog:
+            par_name = self._par_name(name)
+            if par_name is None:
+                raise KeyError("{} is not an available column.".format(name))
+            name = par_name
+
+        if name not in self._columns:
+            self._columns[name] = self._fetch(name)
+        return self._columns[name]
+
+    def __getitem__(self, name):
+        import pandas as pd
+
+        if type(name) == list:
+            return self.to_frame(name)
+        return pd.Series(self.values(name), index=self.index, name=name)
+
+    def __getattr__(self, name):
+        if name.startswith("_"):
+            raise AttributeError(name)
+        # call the property directly, so errors while building the catalog are not masked by __getattr__
+        if name in LazyMeshFrame.catalog.fget(self):
+            return self[name]
+        raise AttributeError("{} is not an available column.".format(name))
+
+    def to_frame(self, columns=None):
+        """
+        Return the given columns (default: base columns and all fetched columns) as pandas.DataFrame.
+
+        :param columns: list of column names or ifm.Enum values
+        :type columns:  list or None
+        :return:        pandas.DataFrame
+        """
+        import pandas as pd
+
+        if columns is None:
+            columns = self._base_columns() + [c for c in self.cached if c not in self._base_columns()]
+        return pd.DataFrame({c: self.values(c) for c in columns}, index=self.index)
+
+    def __repr__(self):
+        return "<LazyMeshFrame {} rows, {} columns available, {} fetched>".format(
+            len(self), len(self.catalog), len(self.cached))
@@ -0,0 +1,258 @@
+import numpy as np
+
+
+class PointLocation:
+    """
+    Result of a point location (see doc.c.mesh.locate). For each point, the containing element and the nodes and
+    interpolation weights (shape function values) of that element are stored. Points outside the mesh have
+    element -1 and zero weights. The object does not depend on nodal values and can be reused across time steps.
+    """
+
+    def __init__(self, elements, nodes, weights):
+        self.elements = elements
+        self.nodes = nodes
+        self.weights = weights
+
+    @property
+    def found(self):
+        """
+        Boolean mask of the points located inside the mesh.
+        """
+        return self.elements >= 0
+
+    def __len__(self):
+        return len(self.elements)
+
+    def interpolate(self, values):
+        """
+        Interpolate nodal values at the located points. Points outside the mesh return nan.
+
+        :param values: nodal values (length number of nodes)
+        :type values:  array-like
+        :return:       numpy.ndarray of interpolated values
+        """
+        values = np.asarray(values, dtype=np.float64)
+        # padding nodes (4th node of triangles) have zero weight and must not propagate nan
+        result = (self.weights * np.where(self.weights != 0, values[self.nodes], 0.)).sum(axis=1)
+        result[~self.found] = np.nan
+        return result
+
+    def as_sparse(self, n_nodes):
+        """
+        Return the interpolation weights as sparse matrix of shape (n_points, n_nodes). Requires scipy (sparse extra).
+
+        :param n_nodes: number of nodes of the model
+        :type n_nodes:  int
+        :return:        scipy.sparse.csr_matrix
+        """
+        from scipy.sparse import csr_matrix
+
+        rows = np.repeat(np.arange(len(self.elements)), self.nodes.shape[1])
+        return csr_matrix((self.weights.ravel(), (rows, self.nodes.ravel())), shape=(len(self.elements), n_nodes))
+
+
+class PointLocator:
+    """
+    Spatial index for locating points in the mesh. Elements are indexed by their bounding boxes on a uniform grid
+    over the 2D footprint (the top layer of layered 3D meshes). In layered 3D meshes, the layer is found by
+    interpolating the slice elevations at the point location.
+    """
+
+    # tolerance of local coordinates for the point-in-element test
+    tolerance = 1e-9
+
+    # number of points processed at once
+    chunk_size = 100000
+
+    def __init__(self, topology):
+        self.topology = topology
+        self.coordinates_version = topology.coordinates_version
+        t = topology
+
+        if t.n_dimensions == 2:
+            elements = np.arange(t.n_elements)
+            nn = t.nn
+        elif t.is_layered:
+            elements = np.arange(t.elements_per_layer)
+            nn = t.nn[elements] // 2  # top nodes only
+        else:
+            raise NotImplementedError("point location is only supported for 2D and layered 3D meshes")
+
+        if not np.isin(nn, [3, 4]).all():
+            raise NotImplementedError("point location supports triangular and quadrilateral elements only")
+
+        # footprint incidence, -1 for the missing 4th node of triangles
+        self.footprint = np.full((len(elements), 4), -1, dtype=np.int64)
+        for k in range(4):
+            mask = nn > k
+            self.footprint[mask, k] = t.nodes[t.offsets[elements[mask]] + k]
+        self.is_triangle = self.footprint[:, 3] < 0
+
+        # bounding boxes
+        fp = np.where(self.footprint < 0, self.footprint[:, :1], self.footprint)
+        x, y = t.x[fp], t.y[fp]
+        bx0, bx1, by0, by1 = x.min(axis=1), x.max(axis=1), y.min(axis=1), y.max(axis=1)
+
+        # uniform grid with approximately one cell per element
+        self.x0, self.y0 = bx0.min(), by0.min()
+        width, height = bx1.max() - self.x0, by1.max() - self.y0
+        self.cell = max(np.sqrt(width * height / max(len(elements), 1)), max(width, height) / 1e6, 1e-12)
+        self.nx = int(width / self.cell) + 1
+        self.ny = int(height / self.cell) + 1
+
+        ix0, ix1 = self._cell_index(bx0, self.nx, self.x0), self._cell_index(bx1, self.nx, self.x0)
+        iy0, iy1 = self._cell_index(by0, self.ny, self.y0), self._cell_index(by1, self.ny, self.y0)
+        w, h = ix1 - ix0 + 1, iy1 - iy0 + 1
+        count = w * h
+
+        owner = np.repeat(np.arange(len(elements)), count)
+        local = np.arange(count.sum()) - np.repeat(np.cumsum(count) - count, count)
+        cell_id = (iy0[owner] + local // w[owner]) * self.nx + ix0[owner] + local % w[owner]
+
+        order = np.argsort(cell_id, kind="stable")
+        self.cell_elements = owner[order]
+        self.cell_offsets = np.zeros(self.nx * self.ny + 1, dtype=np.int64)
+        np.cumsum(np.bincount(cell_id, minlength=self.nx * self.ny), out=self.cell_offsets[1:])
+
+    def _cell_index(self, v, n, v0):
+        return np.clip(np.floor((v - v0) / self.cell).astype(np.int64), 0, n - 1)
+
+    def _weights(self, candidates, px, py):
+        """
+        Return the shape function values of the candidate footprint elements at the given points and a mask
+        indicating if the point is inside the element.
+        """
+        t = self.topology
+        weights = np.zeros((len(candidates), 4))
+        inside = np.zeros(len(candidates), dtype=bool)
+        tol = self.tolerance
+
+        # triangles: barycentric coordinates
+        tri = np.flatnonzero(self.is_triangle[candidates])
+        if len(tri) > 0:
+            fp = self.footprint[candidates[tri]]
+            x0, x1, x2 = t.x[fp[:, 0]], t.x[fp[:, 1]], t.x[fp[:, 2]]
+            y0, y1, y2 = t.y[fp[:, 0]], t.y[fp[:, 1]], t.y[fp[:, 2]]
+            det = (x1 - x0) * (y2 - y0) - (x2 - x0) * (y1 - y0)
+            with np.errstate(divide="ignore", invalid="ignore"):
+                l1 = ((px[tri] - x0) * (y2 - y0) - (x2 - x0) * (py[tri] - y0)) / det
+                l2 = ((x1 - x0) * (py[tri] - y0) - (px[tri] - x0) * (y1 - y0)) / det
+            l0 = 1. - l1 - l2
+            weights[tri, 0], weights[tri, 1], weights[tri, 2] = l0, l1, l2
+            inside[tri] = (l0 >= -tol) & (l1 >= -tol) & (l2 >= -tol)
+
+        # quadrilaterals: inverse bilinear mapping by Newton iteration
+        quad = np.flatnonzero(~self.is_triangle[candidates])
+        if len(quad) > 0:
+            fp = self.footprint[candidates[quad]]
+            xq, yq = t.x[fp], t.y[fp]
+            sx = np.array([-1., 1., 1., -1.])
+            sy = np.array([-1., -1., 1., 1.])
+            xi = np.zeros(len(quad))
+            eta = np.zeros(len(quad))
+            with np.errstate(divide="ignore", invalid="ignore"):
+                for _ in range(10):
+                    N = 0.25 * (1 + sx[None, :] * xi[:, None]) * (1 + sy[None, :] * eta[:, None])
+                    dN_dxi = 0.25 * sx[None, :] * (1 + sy[None, :] * eta[:, None])
+                    dN_deta = 0.25 * sy[None, :] * (1 + sx[None, :] * xi[:, None])
+                    fx = (N * xq).sum(axis=1) - px[quad]
+                    fy = (N * yq).sum(axis=1) - py[quad]
+                    j11, j12 = (dN_dxi * xq).sum(axis=1), (dN_deta * xq).sum(axis=1)
+                    j21, j22 = (dN_dxi * yq).sum(axis=1), (dN_deta * yq).sum(axis=1)
+                    det = j11 * j22 - j12 * j21
+                    xi = xi - (j22 * fx - j12 * fy) / det
+                    eta = eta - (j11 * fy - j21 * fx) / det
+            weights[quad] = 0.25 * (1 + sx[None, :] * xi[:, None]) * (1 + sy[None, :] * eta[:, None])
+            inside[quad] = (np.abs(xi) <= 1 + tol) & (np.abs(eta) <= 1 + tol)
+
+        return weights, inside
+
+    def locate_2d(self, px, py):
+        """
+        Locate points (local coordinates) in the 2D footprint.
+
+        :return: tuple (footprint element, footprint nodes, weights), element is -1 if outside the mesh.
+        """
+        n = len(px)
+        elements = np.full(n, -1, dtype=np.int64)
+        weights = np.zeros((n, 4))
+
+        for start in range(0, n, self.chunk_size):
+            cx, cy = px[start:start + self.chunk_size], py[start:start + self.chunk_size]
+            ix = np.floor((cx - self.x0) / self.cell)
+            iy = np.floor((cy - self.y0) / self.cell)
+            valid = (ix >= 0) & (ix < self.nx) & (iy >= 0) & (iy < self.ny)
+            cell_id = np.where(valid, iy * self.nx + ix, 0).astype(np.int64)
+
+            count = np.where(valid, self.cell_offsets[cell_id + 1] - self.cell_offsets[cell_id], 0)
+            point = np.repeat(np.arange(len(cx)), count)
+            index = np.repeat(self.cell_offsets[cell_id] - (np.cumsum(count) - count), count) + np.arange(count.sum())
+            candidates = self.cell_elements[index]
+
+            w, inside = self._weights(candidates, cx[point], cy[point])
+            hit = np.flatnonzero(inside)
+            hit_points, first = np.unique(point[hit], return_index=True)
+            elements[start + hit_points] = candidates[hit[first]]
+            weights[start + hit_points] = w[hit[first]]
+
+        nodes = np.where(elements[:, None] >= 0, self.footprint[np.maximum(elements, 0)], 0)
+        nodes = np.maximum(nodes, 0)  # padding of triangles has zero weight
+        return elements, nodes, weights
+
+    def locate(self, points, global_cos=True, slice=None):
+        """
+        Locate points in the mesh, see doc.c.mesh.locate.
+        """
+        t = self.topology
+        points = np.asarray(points, dtype=np.float64)
+        if points.ndim != 2 or points.shape[1] not in [2, 3]:
+            raise ValueError("points must be an array of shape (n, 2) or (n, 3)")
+
+        px, py = points[:, 0], points[:, 1]
+        if global_cos:
+            px, py = px - t.origin[0], py - t.origin[1]
+
+        elements, nodes, weights = self.locate_2d(px, py)
+        found = elements >= 0
+
+        if t.n_dimensions == 2:
+            return PointLocation(elements, nodes, weights)
+
+        ee, nps = t.elements_per_layer, t.nodes_per_slice
+
+        if slice is not None:
+            if slice < 1 or slice > t.n_layers + 1:
+                raise ValueError("slice number out of range.")
+            layer = min(slice, t.n_layers)
+            elements = np.where(found, elements + (layer - 1) * ee, -1)
+            return PointLocation(elements, nodes + (slice - 1) * nps, weights)
+
+        if points.shape[1] != 3:
+            raise ValueError("z coordinate or slice required for point location in 3D models")
+        pz = points[:, 2]
+
+        def z_slice(s):
+            # elevation of slice(s) (0-based) at the points location
+            return (weights * t.z[nodes + (s * nps)[..., None]]).sum(axis=1)
+
+        # count the slices above each point, one slice at a time to limit memory
+        tol = self.tolerance * np.maximum(1., np.abs(pz))
+        above = np.zeros(len(pz), dtype=np.int64)
+        for s in range(t.n_layers + 1):
+            above += z_slice(np.full(len(pz), s)) >= pz - tol
+        inside = found & (pz <= z_slice(np.zeros(len(pz), dtype=np.int64)) + tol) & \
+                 (pz >= z_slice(np.full(len(pz), t.n_layers)) - tol)
+        layer = np.clip(above - 1, 0, t.n_layers - 1)
+
+        z_top, z_bottom = z_slice(layer), z_slice(layer + 1)
+        thickness = z_top - z_bottom
+        with np.errstate(divide="ignore", invalid="ignore"):
+            s = np.where(thickness > 0, (z_top - pz) / thickness, 0.)
+        s = np.clip(s, 0., 1.)
+
+        elements = np.where(inside, elements + layer * ee, -1)
+        nodes = np.hstack([nodes + (layer * nps)[:, None], nodes + ((layer + 1) * nps)[:, None]])
+        weights = np.hstack([weights * (1 - s)[:, None], weights * s[:, None]])
+        weights[~inside] = 0.
+
+        return PointLocation(elements, nodes, weights)
@@ -2,6 +2,8 @@ import ifm
 from ifm import Enum
 import numpy as np
 
+from .mesh_lazy import LazyMeshFrame
+
 
 class MeshPd:
     """
@@ -11,8 +13,130 @@ class MeshPd:
     def __init__(self, doc):
         self.doc = doc
 
+    # dtype policies of nodes() and elements(), see the dtypes argument
+    dtype_policies = {
+        "default": {"float": "float64", "int": "int64", "layer": None},
+        "compact": {"float": "float32", "int": "int32", "layer": "category"},
+    }
+
+    @staticmethod
+    def _take(values, index):
+        """
+        Return the rows of a model-wide array at the given item index (all rows if index is None).
+        """
+        values = np.asarray(values)
+        return values if index is None else values[index]
+
+    def _dtype_policy(self, dtypes=None):
+        """
+        Resolve the dtypes argument of nodes() and elements() into a dict {"float", "int", "layer"}.
+        """
+        if dtypes is None:
+            dtypes = "default"
+        if type(dtypes) == str:
+            if dtypes not in self.dtype_policies:
+                raise ValueError("dtypes must be one of {} or a dict".format(", ".join(self.dtype_policies)))
+            return dict(self.dtype_policies[dtypes])
+        if type(dtypes) == dict:
+            unknown = set(dtypes) - {"float", "int", "layer"}
+            if unknown:
+                raise ValueError("unknown dtypes keys: {}".format(", ".join(sorted(unknown))))
+            policy = dict(self.dtype_policies["default"])
+            policy.update(dtypes)
+            return policy
+        raise ValueError("dtypes must be None, str or dict")
+
+    def _column(self, values, index=None, dtype="float64"):
+        """
+        Return a column of values at the given item index as new array of the given dtype, with the no-data
+        value -99999 replaced by nan in place.
+        """
+        values = np.asarray(values)
+        values = values.astype(dtype) if index is None else values[index].astype(dtype, copy=False)
+        values[values == -99999.0] = np.nan
+        return values
+
+    @staticmethod
+    def _layer_column(values, n, dtype=None):
+        """
+        Return a LAYER or SLICE column. values is None for unstructured meshes.
+        """
+        import pandas as pd
+
+        if dtype is None:  # legacy: integer for layered, None for unstructured meshes
+            return [None] * n if values is None else values
+        if dtype == "category":
+            return pd.Categorical([None] * n if values is None else values)
+        return pd.array([pd.NA] * n if values is None else values, dtype=dtype)
+
+    def _element_index(self, selection=None, layer=None):
+        """
+        Resolve the row filters of elements() into an array of element numbers, or None if no filter is given.
+        """
+        if selection is None and layer is None:
+            return None
+
+        index = np.arange(self.doc.getNumberOfElements())
+
+        # filter by given selection
+        if selection is not None:
+            if type(selection) == str:
+                # check if selection has the right type
+                if self.doc.c.sel.getSelectionType(selection) != Enum.SEL_ELEMENTAL:
+                    raise ValueError("Must be an elemental distribution!")
+                index = np.intersect1d(index, np.fromiter(self.doc.c.sel.set(selection), dtype=np.int64))
+            elif type(selection) == list and any([(type(m)==int) for m in selection]):
+                index = np.asarray(selection, dtype=np.int64)
+            else:
+                raise ValueError("selection must be name of elemental selection (str) or list of element numbers!")
+
+        # filter by layer
+        if layer is not None:
+            # if only single layer requested, create list with one element
+            if type(layer) == int:
+                layer = [layer]
+            if self.doc.getNumberOfLayers() == -1:  # unstructured mesh, no layers
+                index = index[:0]
+            else:
+                index = index[np.isin(index // self.doc.getNumberOfElementsPerLayer() + 1, layer)]
+
+        return index
+
+    def _node_index(self, selection=None, slice=None):
+        """
+        Resolve the row filters of nodes() into an array of node numbers, or None if no filter is given.
+        """
+        if selection is None and slice is None:
+            return None
+
+        index = np.arange(self.doc.getNumberOfNodes())
+
+        # filter by given selection
+        if selection is not None:
+            if type(selection) == str:
+                # check if selection has the right type
+                if self.doc.c.sel.getSelectionType(selection) != Enum.SEL_NODAL:
+                    raise ValueError("{} not a nodal distribution!".format(selection))
+                index = np.intersect1d(index, np.fromiter(self.doc.c.sel.set(selection), dtype=np.int64))
+            elif type(selection) == list and any([(type(m)==int) for m in selection]):
+                index = np.asarray(selection, dtype=np.int64)
+            else:
+                raise ValueError("selection must be name of nodal selection (str) or list of node numbers!")
+
+        # filter by slice
+        if slice is not None:
+            # if only single slice requested, create list with one element
+            if type(slice) == int:
+                slice = [slice]
+            if self.doc.getNumberOfNodesPerElement() == 0:  # unstructured mesh, no slices
+                index = index[:0]
+            else:
+                index = index[np.isin(index // self.doc.getNumberOfNodesPerSlice() + 1, slice)]
+
+        return index
+
     def elements(self, par=None, expr=None, distr=None, aux=None, layer=None, selection=None, centroids=False, global_cos=True,
-                 content=None, ):
+                 content=None, centroid_tuples=True, lazy=False, dtypes=None):
         """
         Create a Pandas Dataframe with information on the model elements.
 
@@ -31,29 +155,75 @@ class MeshPd:
         :type aux:         str, list or dict.
         :param layer:      if provided in a 3D model, return only elements of this layer
         :type layer:       int
-        :param selection:  if provided in a 3D model, return only elements of this selection
-        :type selection:   str
-        :param centroids:  if True, add coordinates of centroids to DataFrame.
+        :param selection:  if provided, return only elements of this selection (name or list of element numbers)
+        :type selection:   str or list
+        :param centroids:  if True, add coordinates of centroids to DataFrame (columns cx, cy, cz).
         :type centroids:   bool
+        :param centroid_tuples: if True (default), also add the centroids as (x, y, z) tuples in column "centroid".
+                                Set to False to skip creating the tuples if only cx, cy, cz are needed.
+        :type centroid_tuples:  bool
         :param content:    Add elemental content to datafrane. see doc.c.conent.df.info for available items.
                            If True, all content items are returned. if int or list(int), specific items are returned.
         :type content:     None, bool, int, list[int]
+        :param lazy:       if True, return a LazyMeshFrame which fetches columns on first access instead of a
+                           DataFrame. Only the row filters (layer, selection) and global_cos can be combined with lazy.
+                           Fetched columns are reused until the time or mesh changes; call clear() on the frame
+                           after writing values directly to the kernel (e.g. doc.setParamValues()).
+        :type lazy:        bool
+        :param dtypes:     dtype policy: "default" (float64 values, int64 numbers), "compact" (float32 values, int32
+                           numbers, categorical LAYER) or a dict with keys "float", "int" and "layer" (e.g. "Int32").
+                           Coordinates are always float64.
+        :type dtypes:      None, str or dict
         :return:           DataFrame, index of element index, all requested information as columns.
         :rtype:            pandas.DataFrame
         """
 
+        # resolve row filters first, all columns are fetched for the remaining elements only
+        index = self._element_index(selection, layer)
+
+        if lazy:
+            if any(a not in [None, False] for a in [par, expr, distr, aux, content, centroids]):
+                raise ValueError("column arguments can not be combined with lazy=True, columns are fetched on access")
+            return LazyMeshFrame(self.doc, "ELEMENTAL", index=index, global_cos=global_cos)
+
+        dtypes = self._dtype_policy(dtypes)
+        take = index
+        if index is None:
+            index = np.arange(self.doc.getNumberOfElements())
+
+        columns = self._element_columns(index, take, par, expr, distr, aux, centroids, global_cos, content,
+                                        centroid_tuples, dtypes)
+        return self._element_frame(index, columns, dtypes)
+
+    def _element_frame(self, index, columns, dtypes):
+        """
+        Create the elements DataFrame for the given element numbers from the layer columns and the given value
+        columns (dict {column name: values at index}).
+        """
         import pandas as pd
 
-        # create a GeoDataFrame from the mesh
-        df_elements = pd.DataFrame(index=range(self.doc.getNumberOfElements()))
-        df_elements.index.name = "ELEMENT"
+        df_elements = pd.DataFrame(index=pd.Index(index.astype(dtypes["int"]), name="ELEMENT"))
 
         if self.doc.getNumberOfLayers() == -1:  # unstructured mesh
-            df_elements["LAYER"] = None
-            df_elements["TOP_ELEMENT"] = None
+            df_elements["LAYER"] = self._layer_column(None, len(index), dtypes["layer"])
+            df_elements["TOP_ELEMENT"] = self._layer_column(None, len(index), dtypes["layer"])
         else:  # assume layered mesh
-            df_elements["LAYER"] = df_elements.index.values // self.doc.getNumberOfElementsPerLayer() + 1
-            df_elements["TOP_ELEMENT"] = df_elements.index.values % self.doc.getNumberOfElementsPerLayer()
+            layer_values = (index // self.doc.getNumberOfElementsPerLayer() + 1).astype(dtypes["int"])
+            df_elements["LAYER"] = self._layer_column(layer_values, len(index), dtypes["layer"])
+            df_elements["TOP_ELEMENT"] = (index % self.doc.getNumberOfElementsPerLayer()).astype(dtypes["int"])
+
+        for key, values in columns.items():
+            df_elements[key] = values
+
+        return df_elements
+
+    def _element_columns(self, index, take, par=None, expr=None, distr=None, aux=None, centroids=False,
+                         global_cos=True, content=None, centroid_tuples=True, dtypes=None):
+        """
+        Fetch the value columns of elements() for the given element numbers (take is None if all elements are
+        requested) and return them as dict {column name: values}. Each column is fetched from the kernel once.
+        """
+        columns = {}
 
         if par is not None:
             # single items become lists
@@ -64,12 +234,12 @@ class MeshPd:
             if type(par) == list:
                 for parameter_id in par:
                     self.doc.getParamSize(parameter_id)
-                    df_elements[parameter_id] = self.doc.getParamValues(parameter_id)
+                    columns[parameter_id] = self._column(self.doc.getParamValues(parameter_id), take, dtypes["float"])
 
             if type(par) == dict:
                 for key in par:
                     self.doc.getParamSize(par[key])
-                    df_elements[key] = self.doc.getParamValues(par[key])
+                    columns[key] = self._column(self.doc.getParamValues(par[key]), take, dtypes["float"])
 
         if expr is not None:
             # single items become lists
@@ -79,16 +249,8 @@ class MeshPd:
             # process items in list
             if type(expr) == list:
                 for x in expr:
-                    if type(x) == str:
-                        exprID = self.doc.getElementalExprDistrIdByName(x)
-                        if exprID == -1:
-                            raise ValueError("expression {} does not exist!".format(str(x)))
-                    elif type(x) == int:
-                        exprID = x
-                    else:
-                        raise ValueError("expr must be string (for name) or integer (for id)")
-                    df_elements[x] = [self.doc.getElementalExprDistrValue(exprID, n) for n in
-                                      range(self.doc.getNumberOfElements())]
+                    values = self.doc.c.user.expr_values(x, item_type="ELEMENTAL", items=take)
+                    columns[x] = self._column(values, dtype=dtypes["float"])
             elif type(expr)==dict:
                 raise NotImplementedError("dict-type input not implemented for distributions / expressions ")
             else:
@@ -110,7 +272,7 @@ class MeshPd:
                         distrID = d
                     else:
                         raise ValueError("expr distr be string (for name) or integer (for id)")
-                    df_elements[d] = self.doc.getElementalRefDistrValues(distrID)
+                    columns[d] = self._column(self.doc.getElementalRefDistrValues(distrID), take, dtypes["float"])
             elif type(expr)==dict:
                 raise NotImplementedError("dict-type input not implemented for distributions / expressions ")
             else:
@@ -132,7 +294,7 @@ class MeshPd:
                     if p is None:
 
                         raise RuntimeError(str(key)+" is not an available elemental aux parameter.")
-                    df_elements[key] = self.doc.getParamValues(p)
+                    columns[key] = self._column(self.doc.getParamValues(p), take, dtypes["float"])
 
             if type(aux) == dict:
                 for key in aux:
@@ -140,30 +302,20 @@ class MeshPd:
                     if p is None:
                         raise RuntimeError(str(aux[key]) + " is not an available elemental aux parameter.\n" +\
                                            "Available items: "+", ".join(self.doc.c.mesh.available_aux()["elemental"]))
-                    df_elements[key] = self.doc.getParamValues(p)
+                    columns[key] = self._column(self.doc.getParamValues(p), take, dtypes["float"])
 
 
-        # filter by given selection
-        # check if selection has the right type
-        if selection is not None:
-            if self.doc.c.sel.getSelectionType(selection) != Enum.SEL_ELEMENTAL:
-                raise ValueError("Must be an elemental distribution!")
-
-            sele = self.doc.c.sel.set(selection)
-            sele = sele.intersection(set(df_elements.index))
-            df_elements = df_elements.iloc[list(sele)]
-
-        # filter
-        if layer is not None:
-            # if only single layer requested, create list with one element
-            if type(layer) == int:
-                layer = [layer]
-            # filter by layer list
-            df_elements = df_elements.loc[df_elements.LAYER.isin(layer)]
-
         # add centroid values
         if centroids is True:
-            df_elements["centroid"] = [self.doc.c.mesh.getCentroid(e, localcos=(not global_cos)) for e in df_elements.index]
+            cx, cy, cz = self.doc.c.mesh.topology().centroids(index, global_cos=global_cos)
+            columns["cx"] = cx
+            columns["cy"] = cy
+            columns["cz"] = cz
+            if centroid_tuples:
+                if self.doc.getNumberOfDimensions() == 3:
+                    columns["centroid"] = list(zip(cx, cy, cz))
+                else:
+                    columns["centroid"] = [(x, y, None) for x, y in zip(cx, cy)]
 
         # add elemental content
         if content is not None and content is not False:
@@ -177,16 +329,13 @@ class MeshPd:
                 raise ValueError("content must be None, False, True, int or list[int]")
 
             for i, row in self.doc.c.content.df.info().loc[items].iterrows():
-                name = row["ifm.Enum"]
-                try:
-                    df_elements[name] = [self.doc.getElementalContent(i, e) for e in df_elements.index]
-                except RuntimeError:
-                    df_elements[name] = np.nan
+                values = self.doc.c.content.values(i, items=take)
+                columns[row["ifm.Enum"]] = self._column(values, dtype=dtypes["float"])
 
-        return df_elements.replace(-99999.0, np.nan)
+        return columns
 
     def nodes(self, par=None, expr=None, distr=None, aux=None, global_cos=True, slice=None, selection=None, budget=None,
-              velocity=None):
+              velocity=None, lazy=False, dtypes=None):
         """
         Create a Pandas Dataframe with information on the model nodes.
 
@@ -204,35 +353,81 @@ class MeshPd:
         :type global_cos:  bool
         :param slice:      if provided in a 3D model, return only nodes of this slice
         :type slice:       int
-        :param selection:  if provided, return only nodes of this selection
-        :type selection:   str
+        :param selection:  if provided, return only nodes of this selection (name or list of node numbers)
+        :type selection:   str or list
         :param budget:     add nodal budget values to dataframe. Can be "flow", "mass", "heat", or a list like ["flow", "mass].
                            If True, all available budgets will be created. If None, no budget is calculated (default).
         :type budget:       bool, str or [str], None.
+        :param velocity:   if not None, add the velocity components v_x, v_y, (v_z) and v_norm.
+        :type velocity:    bool or None
+        :param lazy:       if True, return a LazyMeshFrame which fetches columns on first access instead of a
+                           DataFrame. Only the row filters (slice, selection) and global_cos can be combined with lazy.
+                           Fetched columns are reused until the time or mesh changes; call clear() on the frame
+                           after writing values directly to the kernel (e.g. doc.setParamValues()).
+        :type lazy:        bool
+        :param dtypes:     dtype policy: "default" (float64 values, int64 numbers), "compact" (float32 values, int32
+                           numbers, categorical SLICE) or a dict with keys "float", "int" and "layer" (e.g. "Int32").
+                           Coordinates are always float64.
+        :type dtypes:      None, str or dict
         :return:           DataFrame, index of element nodes, all requested information as columns.
         :rtype:            pandas.DataFrame
 
         """
 
+        # resolve row filters first, all columns are fetched for the remaining nodes only
+        index = self._node_index(selection, slice)
+
+        if lazy:
+            if any(a is not None for a in [par, expr, distr, aux, budget, velocity]):
+                raise ValueError("column arguments can not be combined with lazy=True, columns are fetched on access")
+            return LazyMeshFrame(self.doc, "NODAL", index=index, global_cos=global_cos)
+
+        dtypes = self._dtype_policy(dtypes)
+        take = index
+        if index is None:
+            index = np.arange(self.doc.getNumberOfNodes())
+
+        columns = self._node_columns(take, par, expr, distr, aux, global_cos, velocity, dtypes)
+        df_nodes = self._node_frame(index, columns, dtypes)
+        self._add_budget(df_nodes, index, budget, dtypes)
+        return df_nodes
+
+    def _node_frame(self, index, columns, dtypes):
+        """
+        Create the nodes DataFrame for the given node numbers from the slice columns and the given value columns
+        (dict {column name: values at index}).
+        """
         import pandas as pd
 
-        # create a GeoDataFrame from the mesh
-        df_nodes = pd.DataFrame(index=range(self.doc.getNumberOfNodes()))
-        df_nodes.index.name = "NODE"
+        df_nodes = pd.DataFrame(index=pd.Index(index.astype(dtypes["int"]), name="NODE"))
 
         if self.doc.getNumberOfNodesPerElement() == 0:  # unstructured mesh
-            df_nodes["SLICE"] = None
-            df_nodes["TOP_NODE"] = None
+            df_nodes["SLICE"] = self._layer_column(None, len(index), dtypes["layer"])
+            df_nodes["TOP_NODE"] = self._layer_column(None, len(index), dtypes["layer"])
         else:  # assume layered mesh
-            df_nodes["SLICE"] = df_nodes.index.values // self.doc.getNumberOfNodesPerSlice() + 1
-            df_nodes["TOP_NODE"] = df_nodes.index.values % self.doc.getNumberOfNodesPerSlice()
+            slice_values = (index // self.doc.getNumberOfNodesPerSlice() + 1).astype(dtypes["int"])
+            df_nodes["SLICE"] = self._layer_column(slice_values, len(index), dtypes["layer"])
+            df_nodes["TOP_NODE"] = (index % self.doc.getNumberOfNodesPerSlice()).astype(dtypes["int"])
+
+        for key, values in columns.items():
+            df_nodes[key] = values
+
+        return df_nodes
+
+    def _node_columns(self, take, par=None, expr=None, distr=None, aux=None, global_cos=True, velocity=None,
+                      dtypes=None):
+        """
+        Fetch the coordinate and value columns of nodes() for the given node numbers (take is None if all nodes are
+        requested) and return them as dict {column name: values}. Each column is fetched from the kernel once.
+        """
+        columns = {}
 
         if global_cos:
             X0, Y0 = self.doc.getOriginX(), self.doc.getOriginY()
         else:
             X0, Y0 = 0, 0
-        df_nodes["X"] = np.array(self.doc.getParamValues(Enum.P_MSH_X)) + X0
-        df_nodes["Y"] = np.array(self.doc.getParamValues(Enum.P_MSH_Y)) + Y0
+        columns["X"] = self._take(self.doc.getParamValues(Enum.P_MSH_X), take) + X0
+        columns["Y"] = self._take(self.doc.getParamValues(Enum.P_MSH_Y), take) + Y0
 
         if par is not None:
             # single items become lists
@@ -243,12 +438,12 @@ class MeshPd:
             if type(par) == list:
                 for parameter_id in par:
                     self.doc.getParamSize(parameter_id)
-                    df_nodes[parameter_id] = self.doc.getParamValues(parameter_id)
+                    columns[parameter_id] = self._column(self.doc.getParamValues(parameter_id), take, dtypes["float"])
 
             if type(par) == dict:
                 for key in par:
                     self.doc.getParamSize(par[key])
-                    df_nodes[key] = self.doc.getParamValues(par[key])
+                    columns[key] = self._column(self.doc.getParamValues(par[key]), take, dtypes["float"])
 
         if expr is not None:
             # single items become lists
@@ -256,16 +451,8 @@ class MeshPd:
                 expr = [expr]
 
             for x in expr:
-                if type(x) == str:
-                    exprID = self.doc.getNodalExprDistrIdByName(x)
-                elif type(x) == int:
-                    exprID = x
-                else:
-                    raise ValueError("expr must be string (for name) or integer (for id)")
-                if exprID == -1:
-                    raise ValueError("Expression " + str(x) + " not found!")
-
-                df_nodes[x] = [self.doc.getNodalExprDistrValue(exprID, n) for n in range(self.doc.getNumberOfNodes())]
+                values = self.doc.c.user.expr_values(x, item_type="NODAL", items=take)
+                columns[x] = self._column(values, dtype=dtypes["float"])
 
         if distr is not None:
             # single items become lists
@@ -275,11 +462,13 @@ class MeshPd:
             for d in distr:
                 if type(d) == str:
                     distrID = self.doc.getNodalRefDistrIdByName(d)
+                    if distrID == -1:
+                        raise ValueError("reference distribution {} does not exist!".format(str(d)))
                 elif type(d) == int:
                     distrID = d
                 else:
                     raise ValueError("expr distr be string (for name) or integer (for id)")
-                df_nodes[d] = self.doc.getNodalRefDistrValues(distrID)
+                columns[d] = self._column(self.doc.getNodalRefDistrValues(distrID), take, dtypes["float"])
 
         if aux is not None:
             # version check
@@ -297,7 +486,7 @@ class MeshPd:
                     if p is None:
                         raise RuntimeError(str(key) + " is not an available nodal aux parameter.\n" +\
                                         "Available items: "+", ".join(self.doc.c.mesh.available_aux()["nodal"]))
-                    df_nodes[key] = self.doc.getParamValues(p)
+                    columns[key] = self._column(self.doc.getParamValues(p), take, dtypes["float"])
 
             if type(aux) == dict:
                 for key in aux:
@@ -305,86 +494,232 @@ class MeshPd:
                     if p is None:
                         raise RuntimeError(str(key) + " is not an available nodal aux parameter.\n" + \
                                            "Available items: " + ", ".join(self.doc.c.mesh.available_aux()["nodal"]))
-                    df_nodes[key] = self.doc.getParamValues(p)
+                    columns[key] = self._column(self.doc.getParamValues(p), take, dtypes["float"])
 
         if velocity is not None:
-            df_nodes["v_x"] = [self.doc.getResultsXVelocityValue(n) for n in range(self.doc.getNumberOfNodes())]
-            df_nodes["v_y"] = [self.doc.getResultsYVelocityValue(n) for n in range(self.doc.getNumberOfNodes())]
-            if self.doc.pdoc.getNumberOfDimensions() == 3:
-                df_nodes["v_norm"] = [self.doc.getResultsZVelocityValue(n) for n in range(self.doc.getNumberOfNodes())]
-            df_nodes["v_norm"] = [self.doc.getResultsVelocityNormValue(n) for n in range(self.doc.getNumberOfNodes())]
+            for key, values in self.doc.c.mesh.velocity(items=take).items():
+                columns[key] = self._column(values, dtype=dtypes["float"])
 
-        # filter by given selection
-        if selection is not None:
-            if type(selection) == str:
-                # check if selection has the right type
-                if self.doc.c.sel.getSelectionType(selection) != Enum.SEL_NODAL:
-                    raise ValueError("{} not a nodal distribution!".format(selection))
-                sele = self.doc.c.sel.set(selection)
-                sele = sele.intersection(set(df_nodes.index))
-            elif type(selection) == list and any([(type(m)==int) for m in selection]):
-                sele = selection
+        return columns
+
+    def _add_budget(self, df_nodes, index, budget, dtypes):
+        """
+        Add nodal budget columns for the given node numbers to df_nodes (see nodes()).
+        """
+        if budget is None:
+            return
+
+        # if a single budget type is provided as str, convert to single-member list first
+        if type(budget) == str:
+            budget = [budget]
+
+        # if budget is True, create all available budgets
+        if budget is True:
+            budget = ["flow"]
+            if self.doc.pdoc.getProblemClass() in [Enum.PCLS_MASS_TRANSPORT, Enum.PCLS_THERMOHALINE]:
+                budget.append("mass")
+            if self.doc.pdoc.getProblemClass() in [Enum.PCLS_HEAT_TRANSPORT, Enum.PCLS_THERMOHALINE]:
+                budget.append("heat")
+
+        # compute nodal budget values of the given nodes, one query per node
+        for budget_type in ["flow", "mass", "heat"]:
+            if budget_type in budget:
+                components = self.doc.c.bdgt.nodal_budget(budget_type, nodes=index)
+                for key, values in components.items():
+                    df_nodes["budget_{}_{}".format(budget_type, key)] = self._column(values, dtype=dtypes["float"])
+
+    def iter_nodes(self, chunk_size=1000000, par=None, expr=None, distr=None, aux=None, global_cos=True, slice=None,
+                   selection=None, budget=None, velocity=None, dtypes=None):
+        """
+        Generator yielding the nodes DataFrame (see nodes()) in chunks of at most chunk_size rows, so that large
+        models can be exported or aggregated without building one large DataFrame. Row filters are resolved and
+        each column is fetched from the kernel once; the chunks are built from row slices of these columns.
+        Nodal budgets are computed per chunk.
+
+        :param chunk_size: maximum number of rows per DataFrame
+        :type chunk_size:  int
+        :return:           generator of pandas.DataFrame
+
+        See nodes() for the other arguments.
+        """
+        if chunk_size < 1:
+            raise ValueError("chunk_size must be a positive integer")
+
+        index = self._node_index(selection, slice)
+        dtypes = self._dtype_policy(dtypes)
+        take = index
+        if index is None:
+            index = np.arange(self.doc.getNumberOfNodes())
+
+        columns = self._node_columns(take, par, expr, distr, aux, global_cos, velocity, dtypes)
+        for start in range(0, len(index), chunk_size):
+            rows = np.s_[start:start + chunk_size]
+            df_nodes = self._node_frame(index[rows], {key: values[rows] for key, values in columns.items()}, dtypes)
+            self._add_budget(df_nodes, index[rows], budget, dtypes)
+            yield df_nodes
+
+    def iter_elements(self, chunk_size=1000000, par=None, expr=None, distr=None, aux=None, layer=None,
+                      selection=None, centroids=False, global_cos=True, content=None, centroid_tuples=True,
+                      dtypes=None):
+        """
+        Generator yielding the elements DataFrame (see elements()) in chunks of at most chunk_size rows, so that
+        large models can be exported or aggregated without building one large DataFrame. Row filters are resolved
+        and each column is fetched from the kernel once; the chunks are built from row slices of these columns.
+
+        :param chunk_size: maximum number of rows per DataFrame
+        :type chunk_size:  int
+        :return:           generator of pandas.DataFrame
+
+        See elements() for the other arguments.
+        """
+        if chunk_size < 1:
+            raise ValueError("chunk_size must be a positive integer")
+
+        index = self._element_index(selection, layer)
+        dtypes = self._dtype_policy(dtypes)
+        take = index
+        if index is None:
+            index = np.arange(self.doc.getNumberOfElements())
+
+        columns = self._element_columns(index, take, par, expr, distr, aux, centroids, global_cos, content,
+                                        centroid_tuples, dtypes)
+        for start in range(0, len(index), chunk_size):
+            rows = np.s_[start:start + chunk_size]
+            yield self._element_frame(index[rows], {key: values[rows] for key, values in columns.items()}, dtypes)
+
+    def _value_columns(self, items, par=None, expr=None, distr=None):
+        """
+        Return a dict {column name: numpy.ndarray} with parameter, expression and distribution values of all nodes
+        (items="nodes") or elements (items="elements"), as returned by the kernel (no-data values not masked).
+        """
+        nodal = items == "nodes"
+        columns = {}
+
+        if par is not None:
+            if type(par) == int:
+                par = [par]
+            if type(par) == list:
+                par = {self.doc.c.mesh.parameter_name(parameter_id): parameter_id for parameter_id in par}
+            for key, parameter_id in par.items():
+                self.doc.getParamSize(parameter_id)
+                columns[key] = np.asarray(self.doc.getParamValues(parameter_id), dtype=np.float64)
+
+        if expr is not None:
+            if type(expr) == str:
+                expr = [expr]
+            for x in expr:
+                columns[x] = self.doc.c.user.expr_values(x, item_type="NODAL" if nodal else "ELEMENTAL")
+
+        if distr is not None:
+            if type(distr) == str:
+                distr = [distr]
+            if nodal:
+                get_distr_id, get_distr_values = self.doc.getNodalRefDistrIdByName, self.doc.getNodalRefDistrValues
             else:
-                raise ValueError("selection must be name of nodal selection (str) or list of node numbers!")
-            df_nodes = df_nodes.iloc[list(sele)]
+                get_distr_id, get_distr_values = self.doc.getElementalRefDistrIdByName, \
+                                                 self.doc.getElementalRefDistrValues
+            for d in distr:
+                distrID = get_distr_id(d) if type(d) == str else d
+                if distrID == -1:
+                    raise ValueError("reference distribution {} does not exist!".format(str(d)))
+                columns[d] = np.asarray(get_distr_values(distrID), dtype=np.float64)
 
-        # filter
-        if slice is not None:
-            # if only single slice requested, create list with one element
-            if type(slice) == int:
-                slice = [slice]
-            # filter by layer list
-            df_nodes = df_nodes.loc[df_nodes.SLICE.isin(slice)]
-
-        # create nodal budgets
-        if budget is not None:
-
-            # if a single budget type is provided as str, convert to single-member list first
-            if type(budget) == str:
-                budget = [budget]
-
-            # if budget is True, create all available budgets
-            if budget is True:
-                budget = ["flow"]
-                if self.doc.pdoc.getProblemClass() in [Enum.PCLS_MASS_TRANSPORT, Enum.PCLS_THERMOHALINE]:
-                    budget.append("mass")
-                if self.doc.pdoc.getProblemClass() in [Enum.PCLS_HEAT_TRANSPORT, Enum.PCLS_THERMOHALINE]:
-                    budget.append("heat")
-
-            # compute nodal values for the flow budget
-            if "flow" in budget:
-                bdgt = self.doc.budgetFlowCreate()
-                df_nodes["budget_flow_bc"] = [self.doc.budgetComponentsQueryFlowAtNode2(bdgt, n)[1] for n in
-                                              map(int, df_nodes.index)]
-                df_nodes["budget_flow_area"] = [self.doc.budgetComponentsQueryFlowAtNode2(bdgt, n)[2] for n in
-                                                map(int, df_nodes.index)]
-                df_nodes["budget_flow_storage"] = [self.doc.budgetComponentsQueryFlowAtNode2(bdgt, n)[3] for n in
-                                                   map(int, df_nodes.index)]
-                self.doc.pdoc.budgetClose(bdgt)
-
-            # compute nodal values for the mass budget
-            if "mass" in budget:
-                bdgt = self.doc.budgetMassCreate()
-                df_nodes["budget_mass_bc"] = [self.doc.budgetComponentsQueryMassAtNode2(bdgt, n)[1] for n in
-                                              map(int, df_nodes.index)]
-                df_nodes["budget_mass_area"] = [self.doc.budgetComponentsQueryMassAtNode2(bdgt, n)[2] for n in
-                                                map(int, df_nodes.index)]
-                df_nodes["budget_mass_storage"] = [self.doc.budgetComponentsQueryMassAtNode2(bdgt, n)[3] for n in
-                                                   map(int, df_nodes.index)]
-                self.doc.pdoc.budgetClose(bdgt)
-
-            # compute nodal values for the heat heat budget
-            if "heat" in budget:
-                bdgt = self.doc.budgetHeatCreate()
-                df_nodes["budget_heat_bc"] = [self.doc.budgetComponentsQueryHeatAtNode2(bdgt, n)[1] for n in
-                                              map(int, df_nodes.index)]
-                df_nodes["budget_heat_area"] = [self.doc.budgetComponentsQueryHeatAtNode2(bdgt, n)[2] for n in
-                                                map(int, df_nodes.index)]
-                df_nodes["budget_heat_storage"] = [self.doc.budgetComponentsQueryHeatAtNode2(bdgt, n)[3] for n in
-                                                   map(int, df_nodes.index)]
-                self.doc.pdoc.budgetClose(bdgt)
-
-        return df_nodes.replace(-99999.0, np.nan)
+        return columns
+
+    def to_parquet(self, path, items="nodes", par=None, expr=None, distr=None, time_steps=None, global_cos=True,
+                   compression="snappy"):
+        """
+        Export a nodes or elements table to Parquet files (requires pyarrow). The tables are built from the
+        underlying numpy arrays, no-data values (-99999) become nulls.
+
+        The mesh table path/<items>.parquet contains the item number, coordinates (nodes: X, Y, Z, SLICE, TOP_NODE)
+        or topology (elements: LAYER, TOP_ELEMENT, NODES as list of node numbers). If time_steps is None, the
+        requested values of the current state are added to this table. Otherwise the values of each time step are
+        written to path/<items>_results/file_index=<i>/part-0.parquet (partitioned by file index of the time step,
+        see doc.c.sim.df.time_steps), together with the simulation time. The last time step remains loaded.
+
+        :param path:        output folder (created if missing)
+        :type path:         str
+        :param items:       "nodes" or "elements"
+        :type items:        str
+        :param par:         parameters as ifm.Enum, list or dict {column name: ifm.Enum}
+        :type par:          int, list or dict
+        :param expr:        name or list of names of user expressions
+        :type expr:         str or list
+        :param distr:       name or list of names of user distributions
+        :type distr:        str or list
+        :param time_steps:  file indices of the time steps to export, or True for all time steps
+        :type time_steps:   list, bool or None
+        :param global_cos:  if True (default), use global instead of local coordinate system
+        :type global_cos:   bool
+        :param compression: Parquet compression codec
+        :type compression:  str
+        :return:            list of files written
+        :rtype:             list
+        """
+        import os
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        if items not in ["nodes", "elements"]:
+            raise ValueError("items must be 'nodes' or 'elements'")
+
+        def table(columns):
+            return pa.table({key: pa.array(values, mask=values == -99999.0) if values.dtype.kind == "f"
+                             else pa.array(values) for key, values in columns.items()})
+
+        os.makedirs(path, exist_ok=True)
+        files = []
+        topology = self.doc.c.mesh.topology()
+
+        # mesh table
+        if items == "nodes":
+            index = np.arange(topology.n_nodes, dtype=np.int64)
+            x, y, z = topology.coordinates(global_cos=global_cos)
+            columns = {"NODE": index, "X": np.asarray(x), "Y": np.asarray(y)}
+            if topology.n_dimensions == 3:
+                columns["Z"] = np.asarray(z)
+            if self.doc.getNumberOfNodesPerElement() != 0:  # layered mesh
+                columns["SLICE"] = index // topology.nodes_per_slice + 1
+                columns["TOP_NODE"] = index % topology.nodes_per_slice
+        else:
+            index = np.arange(topology.n_elements, dtype=np.int64)
+            columns = {"ELEMENT": index}
+            if self.doc.getNumberOfLayers() != -1:  # layered mesh
+                columns["LAYER"] = index // topology.elements_per_layer + 1
+                columns["TOP_ELEMENT"] = index % topology.elements_per_layer
+        if time_steps is None:
+            columns.update(self._value_columns(items, par, expr, distr))
+
+        mesh_table = table(columns)
+        if items == "elements":
+            nodes = pa.LargeListArray.from_arrays(pa.array(np.asarray(topology.offsets, dtype=np.int64)),
+                                                  pa.array(np.asarray(topology.nodes)))
+            mesh_table = mesh_table.append_column("NODES", nodes)
+        filename = os.path.join(path, "{}.parquet".format(items))
+        pq.write_table(mesh_table, filename, compression=compression)
+        files.append(filename)
+
+        if time_steps is None:
+            return files
+
+        # result tables, one partition per time step
+        if time_steps is True:
+            time_steps = list(range(len(self.doc.getTimeSteps())))
+        for file_index in time_steps:
+            self.doc.loadTimeStep(int(file_index))
+            columns = {"NODE" if items == "nodes" else "ELEMENT": index}
+            columns.update(self._value_columns(items, par, expr, distr))
+            result_table = table(columns).append_column(
+                "simulation_time", pa.array(np.full(len(index), self.doc.getAbsoluteSimulationTime())))
+
+            folder = os.path.join(path, "{}_results".format(items), "file_index={}".format(int(file_index)))
+            os.makedirs(folder, exist_ok=True)
+            filename = os.path.join(folder, "part-0.parquet")
+            pq.write_table(result_table, filename, compression=compression)
+            files.append(filename)
+
+        return files
 
     def border_nodes(self, border_number=0, *args , **kwargs):
         """
@@ -445,29 +780,62 @@ class MeshPd:
         # self.doc.queryFaceElements()
         # self.doc.queryFaceNodes()
 
-    def edges(self):
+    def edges(self, method="kernel", verify=False):
         """
         Return a DataFrame with Edges and corresponding properties.
+
+        :param method: "kernel" (default) queries each edge from FEFLOW, the index is the kernel edge number as used
+                       by edge selections and the queryEdge* functions. "incidence" derives the edges from the cached
+                       incidence matrix, which is much faster, but edges are numbered by sorted node pairs and do not
+                       match the kernel edge numbers.
+        :type method:  str
+        :param verify: If True (method "incidence" only), check that the edges derived from the incidence matrix
+                       match the kernel edges.
+        :type verify:  bool
         :return:
         """
 
         import pandas as pd
 
-        # create a GeoDataFrame from the mesh
-        df_edges = pd.DataFrame(index=range(self.doc.getNumberOfEdges()))
-        df_edges.index.name = "EDGE"
+        if method == "kernel":
+            # create a GeoDataFrame from the mesh
+            df_edges = pd.DataFrame(index=range(self.doc.getNumberOfEdges()))
+            df_edges.index.name = "EDGE"
+
+            df_edges["Nodes"] = [self.doc.queryEdgeNodes(d) for d in range(self.doc.getNumberOfEdges())]
+            df_edges["Elements"] = [self.doc.queryEdgeElements(d) for d in range(self.doc.getNumberOfEdges())]
+
+            # calculate Length
+            x, y, z = self.doc.c.mesh.topology().coordinates(global_cos=False)
+            nodes = np.array(df_edges.Nodes.tolist(), dtype=np.int64).reshape(-1, 2)
+            n1, n2 = nodes[:, 0], nodes[:, 1]
+            df_edges["length"] = np.sqrt((x[n2] - x[n1]) ** 2 + (y[n2] - y[n1]) ** 2 + (z[n2] - z[n1]) ** 2)
 
-        df_edges["Nodes"] = [self.doc.queryEdgeNodes(d) for d in range(self.doc.getNumberOfEdges())]
-        df_edges["Elements"] = [self.doc.queryEdgeElements(d) for d in range(self.doc.getNumberOfEdges())]
+            return df_edges
 
-        # calculate Length
-        vec_l = []
-        for i, (n1, n2) in df_edges.Nodes.iteritems():
-            x1, y1, z1 = self.doc.getX(n1), self.doc.getY(n1), self.doc.getZ(n1)
-            x2, y2, z2 = self.doc.getX(n2), self.doc.getY(n2), self.doc.getZ(n2)
-            length = ((x2 - x1) ** 2 + (y2 - y1) ** 2 + (z2 - z1) ** 2) ** 0.5
-            vec_l.append(length)
-        df_edges["length"] = vec_l
+        elif method != "incidence":
+            raise ValueError("method must be 'incidence' or 'kernel'")
+
+        topology = self.doc.c.mesh.topology()
+        edge_nodes, offsets, elements = topology.edges
+
+        df_edges = pd.DataFrame(index=range(len(edge_nodes)))
+        df_edges.index.name = "EDGE"
+        df_edges["node_1"] = edge_nodes[:, 0]
+        df_edges["node_2"] = edge_nodes[:, 1]
+        df_edges["n_elements"] = np.diff(offsets)
+        df_edges["Nodes"] = list(map(tuple, edge_nodes.tolist()))
+        df_edges["Elements"] = np.split(elements, offsets[1:-1])
+        df_edges["length"] = topology.edge_lengths()
+
+        if verify:
+            kernel_edges = set()
+            for d in range(self.doc.getNumberOfEdges()):
+                n1, n2 = self.doc.queryEdgeNodes(d)
+                kernel_edges.add((min(n1, n2), max(n1, n2)))
+            if kernel_edges != set(df_edges["Nodes"]):
+                raise RuntimeError("edges derived from incidence matrix do not match kernel edges "
+                                   "({} vs. {} edges)".format(len(df_edges), len(kernel_edges)))
 
         return df_edges
 
@@ -482,28 +850,8 @@ class MeshPd:
         :return: DataFrame with available items
         :rtype: pandas.DataFrame
         """
-        # TODO: Generalize and move to Enum!
-
-        import pandas as pd
-
-        available_items = []
-        for e in [e for e in dir(Enum) if e.startswith("P_") and e != "P_INVALID"]:
-            e_num = eval("Enum." + e)
-            try:
-                ii = self.doc.getParamSize(e_num)
-                if ii == self.doc.getNumberOfNodes() and ii == self.doc.getNumberOfElements():
-                    itemtype = 'ambiguous'  # n_nodes = n_elements, can't determine type
-                elif ii == self.doc.getNumberOfNodes():
-                    itemtype = 'nodal'
-                elif ii == self.doc.getNumberOfElements():
-                    itemtype = 'elemental'
-                else:
-                    itemtype = 'unknowm'
-                available_items.append((e, e_num, itemtype))
-            except Exception:
-                pass
-
-        df_items = pd.DataFrame(available_items, columns=["Name", "Enum_Constant", "Type"])
+        df_items = self.doc.c.mesh.parameter_catalog()
+        df_items = df_items[~df_items.Aux].reset_index()[["Name", "Enum_Constant", "Type"]]
 
         # filter by type
         if Type is not None:
@@ -529,39 +877,24 @@ class MeshPd:
     def dfe(self):
         """
         Reutrn a DataFrame with information on Discrete Feature Elements in the model.
+        The node columns node_1, node_2 (and node_3, node_4 for models with 2D fractures, -1 if not used) hold the
+        incidence, column type the fracture type (ifm.Enum.FRAC_1D or FRAC_2D).
 
         :return: DataFrame with information on DFE
         :rtype: pandas.DataFrame
         """
-        if self.doc.getNumberOfDimensions() != 3:
-            raise NotImplementedError("this function is currently only available for 3D problems")
-
         import pandas as pd
 
-        df_dfe = pd.DataFrame(
-            [self.doc.getNodalArrayOfFractureElement(f) for f in range(self.doc.getNumberOfTotalFractureElements())],
-            columns=["node_1", "node_2"])
-        df_dfe.index.name = "dfe"
+        arrays = self.doc.c.dfe.arrays(["law", "area", "diameter", "conductivity", "storativity"])
 
-        df_dfe["law"] = [
-            self.doc.getFracLaw(f, Enum.FRAC_1D, Enum.ALL_FRAC_MODES) for f in
-            range(self.doc.getNumberOfTotalFractureElements())]
-
-        df_dfe["area"] = [
-            self.doc.getFracArea(f, Enum.FRAC_1D, Enum.ALL_FRAC_MODES, Enum.ALL_FRAC_LAWS) for f in
-            range(self.doc.getNumberOfTotalFractureElements())]
-
-        df_dfe["diameter"] = [
-            self.doc.getFracElementDiameter(f) for f in
-            range(self.doc.getNumberOfTotalFractureElements())]
-
-        df_dfe["conductivity"] = [
-            self.doc.getFracFlowConductivity(f, Enum.ALL_FRAC_TYPES, Enum.ALL_FRAC_MODES, Enum.ALL_FRAC_LAWS) for f in
-            range(self.doc.getNumberOfTotalFractureElements())]
+        n_columns = max(2, int(arrays["n_nodes"].max(initial=2)))
+        df_dfe = pd.DataFrame(arrays["incidence"][:, :n_columns],
+                              columns=["node_{}".format(k + 1) for k in range(n_columns)])
+        df_dfe.index.name = "dfe"
 
-        df_dfe["storativity"] = [
-            self.doc.getFracFlowStorativity(f, Enum.ALL_FRAC_TYPES, Enum.ALL_FRAC_MODES, Enum.ALL_FRAC_LAWS) for f in
-            range(self.doc.getNumberOfTotalFractureElements())]
+        df_dfe["type"] = arrays["type"]
+        for name in ["law", "area", "diameter", "conductivity", "storativity"]:
+            df_dfe[name] = arrays[name]
 
         # finalize
         return df_dfe
@@ -0,0 +1,518 @@
+from ifm import Enum
+import numpy as np
+
+
+# local node pairs forming the element edges, by number of dimensions and number of element nodes
+ELEMENT_EDGES = {
+    2: {3: [(0, 1), (1, 2), (2, 0)],
+        4: [(0, 1), (1, 2), (2, 3), (3, 0)]},
+    3: {4: [(0, 1), (1, 2), (2, 0), (0, 3), (1, 3), (2, 3)],  # tetrahedron
+        5: [(0, 1), (1, 2), (2, 3), (3, 0), (0, 4), (1, 4), (2, 4), (3, 4)],  # pyramid
+        6: [(0, 1), (1, 2), (2, 0), (3, 4), (4, 5), (5, 3), (0, 3), (1, 4), (2, 5)],  # prism
+        8: [(0, 1), (1, 2), (2, 3), (3, 0), (4, 5), (5, 6), (6, 7), (7, 4),
+            (0, 4), (1, 5), (2, 6), (3, 7)]},  # hexahedron
+}
+
+
+class MeshTopology:
+    """
+    Array-backed representation of the model mesh.
+
+    The incidence matrix is stored in CSR layout: the nodes of element e are
+    `nodes[offsets[e]:offsets[e + 1]]`. The object is built once per document by `doc.c.mesh.topology()`
+    and rebuilt automatically if the mesh dimensions change.
+    """
+
+    # names of the arrays that define the topology (see arrays())
+    array_names = ["x", "y", "z", "nn", "offsets", "nodes"]
+
+    def __init__(self, doc, arrays=None):
+        """
+        :param doc:    the document
+        :param arrays: dict of previously extracted arrays (see arrays()), e.g. from an on-disk cache. If None
+                       (default), the arrays are loaded from the kernel.
+        :type arrays:  dict or None
+        """
+        self.doc = doc
+        self.fingerprint = MeshTopology.get_fingerprint(doc)
+
+        self.n_dimensions = doc.getNumberOfDimensions()
+        self.n_nodes = doc.getNumberOfNodes()
+        self.n_elements = doc.getNumberOfElements()
+        self.n_layers = doc.getNumberOfLayers()
+        self.nodes_per_slice = doc.getNumberOfNodesPerSlice()
+        self.elements_per_layer = doc.getNumberOfElementsPerLayer()
+        self.origin = (doc.getOriginX(), doc.getOriginY())
+
+        self.coordinates_version = 0
+        self._node_elements = None
+        self._edges = None
+        self._is_layered = None
+
+        if arrays is not None:
+            if len(arrays["x"]) != self.n_nodes or len(arrays["nn"]) != self.n_elements:
+                raise ValueError("arrays do not match the mesh of the document")
+            for name in MeshTopology.array_names:
+                setattr(self, name, arrays[name])
+            return
+
+        # node coordinates (local coordinate system)
+        self.x, self.y, self.z = self._read_coordinates()
+
+        # incidence matrix, from the first layer if the mesh is layered, otherwise one kernel call per element
+        if not self._load_layered():
+            self.nn, self.offsets, self.nodes = self._load_elements(range(self.n_elements))
+
+    # number of elements below the first layer compared with the kernel to confirm a layered mesh
+    verify_sample = 100
+
+    def _load_elements(self, elements):
+        """
+        Query the nodes of the given elements from the kernel and return them as CSR arrays (nn, offsets, nodes).
+        """
+        element_nodes = [self.doc.getNodalArrayOfElement(e) for e in elements]
+        nn = np.fromiter((len(el) for el in element_nodes), dtype=np.int32, count=len(element_nodes))
+        offsets = np.zeros(len(element_nodes) + 1, dtype=np.int64)
+        np.cumsum(nn, out=offsets[1:])
+        nodes = np.fromiter((n for el in element_nodes for n in el), dtype=np.int32, count=int(offsets[-1]))
+        return nn, offsets, nodes
+
+    def _load_layered(self):
+        """
+        Build the incidence of a fully layered 3D mesh from a single sweep over the first layer: the incidence of
+        layer k equals the first layer offset by (k - 1) * nodes_per_slice. A sample of the remaining elements is
+        checked against the kernel. Returns False (nothing loaded) if the mesh is not fully layered.
+        """
+        ee, nps, n_layers = self.elements_per_layer, self.nodes_per_slice, self.n_layers
+        if self.n_dimensions != 3 or n_layers <= 1:
+            return False
+        if self.n_elements != n_layers * ee or self.n_nodes != (n_layers + 1) * nps:
+            return False
+
+        nn, offsets, nodes = self._load_elements(range(ee))
+        if not np.isin(nn, [6, 8]).all():
+            return False
+
+        # broadcast first layer to all layers
+        self.nn = np.tile(nn, n_layers)
+        self.offsets = np.zeros(self.n_elements + 1, dtype=np.int64)
+        np.cumsum(self.nn, out=self.offsets[1:])
+        self.nodes = (nodes[None, :] + (np.arange(n_layers, dtype=np.int32) * nps)[:, None]).ravel()
+
+        # verify sample of elements below the first layer (including the last element)
+        sample = np.unique(np.linspace(ee, self.n_elements - 1, num=min(self.verify_sample, self.n_elements - ee),
+                                       dtype=np.int64))
+        for e in sample:
+            if list(self.element_nodes(e)) != list(self.doc.getNodalArrayOfElement(int(e))):
+                return False
+
+        self._is_layered = True
+        return True
+
+    def matches_kernel(self):
+        """
+        Return True if the node coordinates and a sample of the incidence matrix (including the first and last
+        element) equal those of the mesh in the kernel, e.g. to check arrays loaded from an on-disk cache.
+        """
+        x, y, z = self._read_coordinates()
+        if not (np.array_equal(x, self.x) and np.array_equal(y, self.y) and np.array_equal(z, self.z)):
+            return False
+        sample = np.unique(np.linspace(0, self.n_elements - 1, num=min(self.verify_sample, self.n_elements),
+                                       dtype=np.int64))
+        return all(list(self.element_nodes(e)) == list(self.doc.getNodalArrayOfElement(int(e))) for e in sample)
+
+    def arrays(self):
+        """
+        Return the arrays defining the topology as dict {name: numpy.ndarray}.
+        """
+        return {name: getattr(self, name) for name in MeshTopology.array_names}
+
+    @staticmethod
+    def get_fingerprint(doc):
+        """
+        Return a tuple identifying the current mesh. If it differs from the fingerprint of a topology object,
+        the object is outdated.
+        """
+        return (doc.getNumberOfDimensions(),
+                doc.getNumberOfNodes(),
+                doc.getNumberOfElements(),
+                doc.getNumberOfLayers())
+
+    def is_valid(self):
+        """
+        Return True if the topology still matches the mesh of the document.
+        """
+        return self.fingerprint == MeshTopology.get_fingerprint(self.doc)
+
+    @property
+    def element_types(self):
+        """
+        Element type code of each element, given as the number of element nodes (e.g. 3, 4, 6, 8).
+        """
+        return self.nn
+
+    @property
+    def is_layered(self):
+        """
+        True if the mesh is a fully layered 3D mesh, i.e. the incidence of layer k equals the incidence of the
+        first layer offset by (k - 1) * nodes_per_slice.
+        """
+        if self._is_layered is None:
+            self._is_layered = self._check_layered()
+        return self._is_layered
+
+    def _check_layered(self):
+        if self.n_dimensions != 3 or self.n_layers <= 0:
+            return False
+        ee, nps = self.elements_per_layer, self.nodes_per_slice
+        if self.n_elements != self.n_layers * ee or self.n_nodes != (self.n_layers + 1) * nps:
+            return False
+        nn = self.nn.reshape(self.n_layers, ee)
+        if not (nn == nn[0]).all():
+            return False
+        nodes = self.nodes.reshape(self.n_layers, -1)
+        expected = nodes[0][None, :] + (np.arange(self.n_layers) * nps)[:, None]
+        return bool(np.array_equal(nodes, expected))
+
+    @property
+    def active(self):
+        """
+        Boolean mask of active elements. Read from the kernel on every access, as elements may be (de)activated
+        at any time. Use active_mask() if only some of the elements are needed.
+        """
+        return self.active_mask()
+
+    def active_mask(self, elements=None):
+        """
+        Return a boolean mask which is True for the active elements among the given elements. Only the given
+        elements are queried from the kernel.
+
+        :param elements: element numbers (default: all elements)
+        :type elements:  array-like or None
+        :return:         numpy.ndarray(bool), one entry per element.
+        """
+        if elements is None:
+            elements = np.arange(self.n_elements)
+        elements = np.asarray(elements, dtype=np.int64)
+        return np.fromiter((self.doc.getMatElementActive(int(e)) for e in elements),
+                           dtype=bool, count=len(elements))
+
+    def _read_coordinates(self):
+        x = np.asarray(self.doc.getParamValues(Enum.P_MSH_X), dtype=np.float64)
+        y = np.asarray(self.doc.getParamValues(Enum.P_MSH_Y), dtype=np.float64)
+        if self.n_dimensions == 3:
+            z = np.asarray(self.doc.getParamValues(Enum.P_ELEV), dtype=np.float64)
+        else:
+            z = np.zeros(self.n_nodes)
+        return x, y, z
+
+    def update_coordinates(self):
+        """
+        Re-read the node coordinates and the origin from the kernel, e.g. after elevations have changed in
+        moving-mesh or unconfined models or coordinates have been edited. coordinates_version is increased if the
+        coordinates have changed.
+
+        :return: True if the coordinates have changed.
+        :rtype:  bool
+        """
+        x, y, z = self._read_coordinates()
+        origin = (self.doc.getOriginX(), self.doc.getOriginY())
+        if np.array_equal(x, self.x) and np.array_equal(y, self.y) and np.array_equal(z, self.z) and \
+                origin == self.origin:
+            return False
+        self.x, self.y, self.z, self.origin = x, y, z, origin
+        self.coordinates_version += 1
+        return True
+
+    def coordinates(self, global_cos=True):
+        """
+        Return the node coordinates as tuple of numpy arrays (x, y, z).
+
+        :param global_cos: If True (default), use global instead of local coordinate system.
+        :type global_cos:  bool
+        :return:           tuple(numpy.ndarray) (x, y, z)
+        """
+        if global_cos:
+            return self.x + self.origin[0], self.y + self.origin[1], self.z
+        return self.x, self.y, self.z
+
+    def element_nodes(self, e):
+        """
+        Return the nodes of element e as numpy array.
+        """
+        return self.nodes[self.offsets[e]:self.offsets[e + 1]]
+
+    def _gather(self, elements):
+        """
+        Return the concatenated nodes of the given elements and the start position of each element therein.
+        """
+        elements = np.asarray(elements, dtype=np.int64)
+        nn = self.nn[elements].astype(np.int64)
+        starts = np.cumsum(nn) - nn
+        index = np.repeat(self.offsets[elements] - starts, nn) + np.arange(nn.sum())
+        return self.nodes[index], starts
+
+    def nodes_of_elements(self, elements):
+        """
+        Return the unique nodes of the given elements as sorted numpy array.
+
+        :param elements: element numbers
+        :type elements:  array-like
+        :return:         numpy.ndarray of node numbers
+        """
+        nodes, _ = self._gather(elements)
+        return np.unique(nodes)
+
+    @property
+    def node_elements(self):
+        """
+        Node to element adjacency (transpose of the incidence matrix) in CSR layout as tuple (offsets, elements):
+        the elements connected to node n are `elements[offsets[n]:offsets[n + 1]]`. Built on first access.
+        """
+        if self._node_elements is None:
+            owner = np.repeat(np.arange(self.n_elements, dtype=np.int32), self.nn)
+            order = np.argsort(self.nodes, kind="stable")
+            offsets = np.zeros(self.n_nodes + 1, dtype=np.int64)
+            np.cumsum(np.bincount(self.nodes, minlength=self.n_nodes), out=offsets[1:])
+            self._node_elements = (offsets, owner[order])
+        return self._node_elements
+
+    def elements_of_nodes(self, nodes):
+        """
+        Return the unique elements connected to any of the given nodes as sorted numpy array.
+
+        :param nodes: node numbers
+        :type nodes:  array-like
+        :return:      numpy.ndarray of element numbers
+        """
+        offsets, elements = self.node_elements
+        nodes = np.asarray(nodes, dtype=np.int64)
+        count = offsets[nodes + 1] - offsets[nodes]
+        starts = np.cumsum(count) - count
+        index = np.repeat(offsets[nodes] - starts, count) + np.arange(count.sum())
+        return np.unique(elements[index])
+
+    @property
+    def edges(self):
+        """
+        Unique mesh edges derived from the incidence matrix as tuple (edge_nodes, offsets, elements):
+        edge_nodes is an (n_edges, 2) array of node numbers (smaller node first, sorted),
+        the elements adjacent to edge i are `elements[offsets[i]:offsets[i + 1]]`. Built on first access.
+        """
+        if self._edges is None:
+            element_edges = ELEMENT_EDGES[self.n_dimensions]
+            owner = np.arange(self.n_elements, dtype=np.int64)
+
+            node_a, node_b, edge_owner = [], [], []
+            for NN in np.unique(self.nn):
+                NN = int(NN)
+                if NN not in element_edges:
+                    raise NotImplementedError(str(NN) + "-noded element not supported")
+                pairs = np.asarray(element_edges[NN], dtype=np.int64)
+                start = self.offsets[:-1][self.nn == NN]
+                node_a.append(self.nodes[start[:, None] + pairs[None, :, 0]].ravel())
+                node_b.append(self.nodes[start[:, None] + pairs[None, :, 1]].ravel())
+                edge_owner.append(np.repeat(owner[self.nn == NN], len(pairs)))
+
+            node_a = np.concatenate(node_a).astype(np.int64)
+            node_b = np.concatenate(node_b).astype(np.int64)
+            edge_owner = np.concatenate(edge_owner)
+
+            keys = np.minimum(node_a, node_b) * self.n_nodes + np.maximum(node_a, node_b)
+            unique_keys, inverse = np.unique(keys, return_inverse=True)
+            edge_nodes = np.column_stack([unique_keys // self.n_nodes, unique_keys % self.n_nodes]).astype(np.int32)
+
+            order = np.argsort(inverse, kind="stable")
+            offsets = np.zeros(len(unique_keys) + 1, dtype=np.int64)
+            np.cumsum(np.bincount(inverse, minlength=len(unique_keys)), out=offsets[1:])
+            self._edges = (edge_nodes, offsets, edge_owner[order].astype(np.int32))
+        return self._edges
+
+    def edge_lengths(self):
+        """
+        Return the 3D length of each edge (see edges) as numpy array.
+        """
+        edge_nodes, _, _ = self.edges
+        n1, n2 = edge_nodes[:, 0], edge_nodes[:, 1]
+        return np.sqrt((self.x[n2] - self.x[n1]) ** 2 +
+                       (self.y[n2] - self.y[n1]) ** 2 +
+                       (self.z[n2] - self.z[n1]) ** 2)
+
+    def outline(self, elements=None):
+        """
+        Return the outline of the given elements as closed rings of node numbers. Boundary edges (element edges with
+        only one adjacent element in the set) are chained into rings; rings touching at a node are returned as
+        separate rings. In layered 3D meshes, the elements are projected onto the first
+        layer and the outline of their 2D footprint (nodes of the first slice) is returned. Element orientation is
+        normalized per element, so meshes with clockwise or mixed node ordering are traced alike.
+
+        :param elements: element numbers (default: all elements)
+        :type elements:  array-like or None
+        :return:         tuple (rings, exterior): list of numpy arrays of node numbers (last node equals first node),
+                         and a boolean numpy array which is True for outer rings and False for holes.
+        """
+        if self.n_dimensions == 3 and not self.is_layered:
+            raise ValueError("outline requires a 2D or a layered 3D mesh")
+        if elements is None:
+            elements = np.arange(self.n_elements)
+        elements = np.asarray(elements, dtype=np.int64)
+        if self.n_dimensions == 3:
+            elements = np.unique(elements % self.elements_per_layer)
+        if len(elements) == 0:
+            return [], np.zeros(0, dtype=bool)
+
+        # directed edges of the element faces (top face of 3D elements), counter-clockwise (inside on the left)
+        nn = self.nn[elements]
+        node_a, node_b = [], []
+        for NN in np.unique(nn):
+            n_face = int(NN) // 2 if self.n_dimensions == 3 else int(NN)
+            face = self.nodes[self.offsets[elements[nn == NN]][:, None] + np.arange(n_face)[None, :]].astype(np.int64)
+            following = np.roll(face, -1, axis=1)
+            area = np.sum(self.x[face] * self.y[following] - self.x[following] * self.y[face], axis=1)
+            face = np.where((area < 0.)[:, None], face[:, ::-1], face)
+            following = np.roll(face, -1, axis=1)
+            node_a.append(face.ravel())
+            node_b.append(following.ravel())
+        node_a, node_b = np.concatenate(node_a), np.concatenate(node_b)
+
+        # boundary edges are shared by exactly one element of the set
+        keys = np.minimum(node_a, node_b) * self.n_nodes + np.maximum(node_a, node_b)
+        _, inverse, counts = np.unique(keys, return_inverse=True, return_counts=True)
+        boundary = counts[inverse] == 1
+        node_a, node_b = node_a[boundary], node_b[boundary]
+
+        # outgoing boundary edges per node
+        order = np.argsort(node_a, kind="stable")
+        sorted_a = node_a[order]
+        n_out = np.bincount(node_a, minlength=self.n_nodes)
+        successor = np.full(self.n_nodes, -1, dtype=np.int64)
+        successor[node_a] = np.arange(len(node_a))
+        successor = np.where(n_out == 1, successor, -1)[node_b].tolist()  # next edge, if unambiguous
+
+        def next_edge(edge):
+            if successor[edge] >= 0:
+                return successor[edge]
+            node = node_b[edge]
+            candidates = order[np.searchsorted(sorted_a, node):np.searchsorted(sorted_a, node, side="right")]
+            if len(candidates) == 0:
+                raise RuntimeError("outline could not be traced, the mesh is not conforming")
+            # several rings touch at this node: take the sharpest turn towards the inside
+            a, b = node_a[edge], node_b[edge]
+            dx_in, dy_in = self.x[b] - self.x[a], self.y[b] - self.y[a]
+            dx_out, dy_out = self.x[node_b[candidates]] - self.x[b], self.y[node_b[candidates]] - self.y[b]
+            angles = np.arctan2(dx_in * dy_out - dy_in * dx_out, dx_in * dx_out + dy_in * dy_out)
+            return int(candidates[np.argmax(angles)])
+
+        used = [False] * len(node_a)
+        rings, exterior = [], []
+        for first in range(len(node_a)):
+            if used[first]:
+                continue
+            ring = [node_a[first]]
+            edge = first
+            while True:
+                used[edge] = True
+                ring.append(node_b[edge])
+                edge = next_edge(edge)
+                if edge == first:
+                    break
+                if used[edge]:
+                    raise RuntimeError("outline could not be traced, the mesh is not conforming")
+
+            # split rings passing a node twice (e.g. holes touching at a corner) into simple rings
+            path, position = [ring[0]], {ring[0]: 0}
+            for node in ring[1:]:
+                if node not in position:
+                    position[node] = len(path)
+                    path.append(node)
+                    continue
+                loop = np.asarray(path[position[node]:] + [node], dtype=np.int64)
+                for n in path[position[node] + 1:]:
+                    del position[n]
+                del path[position[node] + 1:]
+                loop_area = np.sum(self.x[loop[:-1]] * self.y[loop[1:]] - self.x[loop[1:]] * self.y[loop[:-1]])
+                rings.append(loop)
+                exterior.append(loop_area > 0)
+
+        return rings, np.asarray(exterior, dtype=bool)
+
+    def centroids(self, elements=None, global_cos=True):
+        """
+        Return the centroids (mean of the element node coordinates) of the given elements.
+
+        :param elements:   element numbers (default: all elements)
+        :type elements:    array-like or None
+        :param global_cos: If True (default), use global instead of local coordinate system.
+        :type global_cos:  bool
+        :return:           tuple(numpy.ndarray) (cx, cy, cz), cz is nan in 2D models.
+        """
+        if elements is None:
+            elements = np.arange(self.n_elements)
+        elements = np.asarray(elements, dtype=np.int64)
+        if len(elements) == 0:
+            return np.zeros(0), np.zeros(0), np.zeros(0)
+
+        nodes, starts = self._gather(elements)
+        nn = self.nn[elements]
+        x, y, z = self.coordinates(global_cos=global_cos)
+
+        cx = np.add.reduceat(x[nodes], starts) / nn
+        cy = np.add.reduceat(y[nodes], starts) / nn
+        if self.n_dimensions == 3:
+            cz = np.add.reduceat(z[nodes], starts) / nn
+        else:
+            cz = np.full(len(elements), np.nan)
+        return cx, cy, cz
+
+    def rows(self, elements=None, patterns=None, as_array=False):
+        """
+        Return incidence rows for the given elements. Each element is mapped to one or more rows by
+        a list of local node index patterns per number of element nodes, e.g. {4: [[1, 2, 3], [3, 0, 1]]} splits
+        quadrangles into two triangles. Rows are returned in element order.
+
+        :param elements: element numbers (default: all elements)
+        :type elements:  array-like or None
+        :param patterns: {number of element nodes: [[local node index]]}. If None, return all element nodes.
+        :type patterns:  dict or None
+        :param as_array: If True, return a 2D numpy array (all rows must have the same length)
+        :type as_array:  bool
+        :return:         tuple (rows, owner), rows as list of lists (or numpy array), owner is the element of each row
+        """
+        if elements is None:
+            elements = np.arange(self.n_elements)
+        elements = np.asarray(elements, dtype=np.int64)
+        nn = self.nn[elements]
+        n_split = 1 if patterns is None else max(len(p) for p in patterns.values())
+
+        blocks = []
+        for NN in np.unique(nn):
+            NN = int(NN)
+            if patterns is None:
+                element_patterns = [list(range(NN))]
+            elif NN in patterns:
+                element_patterns = patterns[NN]
+            else:
+                raise NotImplementedError(str(NN) + "-noded element not supported")
+
+            position = np.flatnonzero(nn == NN)
+            start = self.offsets[elements[position]]
+            for j, pattern in enumerate(element_patterns):
+                block = self.nodes[start[:, None] + np.asarray(pattern, dtype=np.int64)[None, :]]
+                blocks.append((position * n_split + j, block))
+
+        if len(blocks) == 0:
+            return ([] if not as_array else np.zeros((0, 0), dtype=np.int32)), np.zeros(0, dtype=np.int64)
+
+        keys = np.concatenate([key for key, _ in blocks])
+        order = np.argsort(keys, kind="stable")
+        owner = elements[keys[order] // n_split]
+
+        widths = set(block.shape[1] for _, block in blocks)
+        if len(widths) == 1:
+            rows = np.concatenate([block for _, block in blocks])[order]
+            return (rows if as_array else rows.tolist()), owner
+
+        if as_array:
+            raise ValueError("rows of different length can not be returned as array")
+        rows = [row for _, block in blocks for row in block.tolist()]
+        return [rows[i] for i in order], owner
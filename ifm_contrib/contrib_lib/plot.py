@@ -1,5 +1,4 @@
 import ifm_contrib as ifm
-from ifm import Enum
 
 from .plot_geopandas import PlotGpd
 from .plot_folium import PlotFolium
@@ -52,13 +51,7 @@ class Plot:
         # read incidence matrix and node coordinates
         imat = self.doc.c.mesh.get_imatrix2d(slice=slice, ignore_inactive=ignore_inactive,
                                              split_quads_to_triangles=True)
-        x, y = self.doc.getParamValues(Enum.P_MSH_X), self.doc.getParamValues(Enum.P_MSH_Y)
-
-        if global_cos:
-            X0 = self.doc.getOriginX()
-            Y0 = self.doc.getOriginY()
-            x = [X + X0 for X in x]
-            y = [Y + Y0 for Y in y]
+        x, y, _ = self.doc.c.mesh.topology().coordinates(global_cos=global_cos)
 
         # create Triangulation object
         femesh = tri.Triangulation(x, y, np.asarray(imat))
@@ -77,13 +70,7 @@ class Plot:
             self.doc.getParamSize(par)  # workaround for a crashbug in FEFLOW
             values = self.doc.getParamValues(par)
         elif expr is not None:
-            if type(expr) == str:
-                exprID = self.doc.getNodalExprDistrIdByName(expr)
-            elif type(expr) == int:
-                exprID = expr
-            else:
-                raise ValueError("expr must be string (for name) or integer (for id)")
-            values = [self.doc.getNodalExprDistrValue(exprID, n) for n in range(self.doc.getNumberOfNodes())]
+            values = self.doc.c.user.expr_values(expr, item_type="NODAL")
         elif distr is not None:
             if type(distr) == str:
                 distrID = self.doc.getNodalRefDistrIdByName(distr)
@@ -95,7 +82,7 @@ class Plot:
         elif velocity is not None:
             if velocity not in ['v_x', 'v_y', 'v_z','v_norm']:
                 raise ValueError("Allowed options vor parameter 'velocity': 'v_x', 'v_y', 'v_z' or 'v_norm'")
-            values = self.doc.c.mesh.df.nodes(velocity=True)[velocity]
+            values = self.doc.c.mesh.velocity()[velocity]
 
         elif values is not None:
             values = values  # OK, so this is just to make clear that we are using the values directly!
@@ -170,26 +170,124 @@ class Sel:
 
         # elemental to nodal
         if from_type == Enum.SEL_ELEMENTAL and to_type == Enum.SEL_NODAL:
-            i_matrix = self.doc.c.mesh.get_imatrix()
-            to_sel = []
-            for e in self.doc.c.sel.list(selection):
-                for n in i_matrix[e]:
-                    to_sel.append(n)
-            return sorted(set(to_sel))  # only unique values
+            topology = self.doc.c.mesh.topology()
+            return topology.nodes_of_elements(self.doc.c.sel.list(selection)).tolist()  # only unique values
 
         # nodal to elemental
         if from_type == Enum.SEL_NODAL and to_type == Enum.SEL_ELEMENTAL:
-
-            to_sel = set()
-            for n in self.doc.c.sel.list(selection):
-                for E in range(self.doc.getNumberOfNodeElements(n)):
-                    to_sel.add(self.doc.getElement(n, E))
-
-            return sorted(list(to_sel))
+            topology = self.doc.c.mesh.topology()
+            return topology.elements_of_nodes(self.doc.c.sel.list(selection)).tolist()
 
         # all other cases not implemented
         raise NotImplementedError()
 
+    def _items(self, selection, seltype=None):
+        """
+        Return the items of a selection (name or list of item indices) as tuple (numpy.ndarray, seltype).
+        """
+        import numpy as np
+
+        if type(selection) == str:
+            if seltype is None:
+                seltype = self.doc.c.sel.getSelectionType(selection)
+            if seltype == Enum.SEL_INVALID:
+                raise ValueError("Selection {} not found".format(selection))
+            items = self.doc.c.sel.list(selection, seltype=seltype)
+        else:
+            if seltype is None:
+                raise ValueError("seltype must be provided if selection is given as list of items")
+            items = selection
+
+        if seltype not in [Enum.SEL_NODAL, Enum.SEL_ELEMENTAL]:
+            raise NotImplementedError("only nodal and elemental selections are supported")
+
+        return np.unique(np.asarray(items, dtype=np.int64)), seltype
+
+    def _neighbours(self, items, seltype):
+        """
+        Return the items and their direct neighbours (one ring) as sorted numpy array.
+        Nodes are neighbours if they share an element, elements are neighbours if they share a node.
+        """
+        topology = self.doc.c.mesh.topology()
+        if seltype == Enum.SEL_NODAL:
+            return topology.nodes_of_elements(topology.elements_of_nodes(items))
+        else:
+            return topology.elements_of_nodes(topology.nodes_of_elements(items))
+
+    def grow(self, selection, rings=1, seltype=None):
+        """
+        Dilate a nodal or elemental selection by the given number of rings of neighbouring items.
+
+        :param selection: name of the selection or list of item indices
+        :type selection:  str or [int]
+        :param rings:     number of rings to add
+        :type rings:      int
+        :param seltype:   type of the selection (required if selection is a list)
+        :type seltype:    ifm.Enum or None
+        :return:          sorted list of item indices
+        """
+        items, seltype = self._items(selection, seltype)
+        for _ in range(rings):
+            items = self._neighbours(items, seltype)
+        return items.tolist()
+
+    def shrink(self, selection, rings=1, seltype=None):
+        """
+        Erode a nodal or elemental selection by the given number of rings, i.e. remove all items that are neighbours
+        of items outside the selection.
+
+        :param selection: name of the selection or list of item indices
+        :type selection:  str or [int]
+        :param rings:     number of rings to remove
+        :type rings:      int
+        :param seltype:   type of the selection (required if selection is a list)
+        :type seltype:    ifm.Enum or None
+        :return:          sorted list of item indices
+        """
+        import numpy as np
+
+        items, seltype = self._items(selection, seltype)
+        if seltype == Enum.SEL_NODAL:
+            n_items = self.doc.getNumberOfNodes()
+        else:
+            n_items = self.doc.getNumberOfElements()
+
+        for _ in range(rings):
+            outside = np.setdiff1d(np.arange(n_items), items, assume_unique=True)
+            items = np.setdiff1d(items, self._neighbours(outside, seltype), assume_unique=True)
+        return items.tolist()
+
+    def intersection(self, selections, seltype=None):
+        """
+        Return the items contained in all given selections. Selections of different types are converted to
+        seltype first (see convert()).
+
+        :param selections: list of selection names (or lists of item indices if seltype is provided)
+        :type selections:  list
+        :param seltype:    type of the result. If None, the type of the first selection is used.
+        :type seltype:     ifm.Enum or None
+        :return:           sorted list of item indices
+        """
+        import numpy as np
+
+        result = None
+        for selection in selections:
+            if type(selection) == str:
+                from_type = self.doc.c.sel.getSelectionType(selection)
+                if seltype is None:
+                    seltype = from_type
+                if from_type != seltype:
+                    items = np.asarray(self.doc.c.sel.convert(selection, seltype), dtype=np.int64)
+                else:
+                    items, _ = self._items(selection, seltype)
+            else:
+                items, _ = self._items(selection, seltype)
+            result = items if result is None else np.intersect1d(result, items, assume_unique=True)
+
+        if result is None:
+            return []
+        return result.tolist()
+
     def clear(self, selname, seltype=None):
         """
         :param selname: name of the selection to be updates
@@ -260,9 +358,9 @@ class Sel:
         if self.doc.c.sel.getSelectionType(selection) == Enum.SEL_NODAL:
             df = self.doc.c.mesh.df.nodes(selection=selection, global_cos=global_cos)
         elif self.doc.c.sel.getSelectionType(selection) == Enum.SEL_ELEMENTAL:
-            df = self.doc.c.mesh.df.elements(selection=selection, global_cos=global_cos, centroids=True)
-            df["X"] = df.centroid.apply(lambda x: x[0])
-            df["Y"] = df.centroid.apply(lambda x: x[1])
+            df = self.doc.c.mesh.df.elements(selection=selection, global_cos=global_cos, centroids=True,
+                                              centroid_tuples=False)
+            df = df.rename(columns={"cx": "X", "cy": "Y"})
         else:
             raise NotImplementedError("This type of selection is not implemented yet")
         minx, maxx = df.X.min(), df.X.max()
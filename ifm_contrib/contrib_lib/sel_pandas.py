@@ -59,15 +59,19 @@ class SelPd:
             df_all['budget_flow_area'] = np.nan
             df_all['budget_flow_storage'] = np.nan
 
-            # compute nodal budget
-            df_nodes = self.doc.c.mesh.df.nodes(budget=True)
-
-            # aggregate nodal flow values to nodal selections (for each of the 3 budget types)
+            # compute nodal budget, only for nodes which are part of any nodal selection
             node_selections = self.doc.c.sel.getSelectionNames(seltype=Enum.SEL_NODES)
-            for b in ['budget_flow_bc', 'budget_flow_area', 'budget_flow_storage']:
-                ds_budget = pd.Series(
-                    data=[df_nodes.loc[df_nodes.index.isin(self.doc.c.sel.list(selname))].sum()[b] for selname in node_selections],
-                    index=node_selections)
-                df_all[b] = ds_budget
+            selection_items = {selname: self.doc.c.sel.list(selname, seltype=Enum.SEL_NODES)
+                               for selname in node_selections}
+            nodes = sorted(set(n for items in selection_items.values() for n in items))
+            if len(nodes) > 0:
+                df_nodes = self.doc.c.mesh.df.nodes(budget="flow", selection=nodes)
+
+                # aggregate nodal flow values to nodal selections (for each of the 3 budget types)
+                for b in ['budget_flow_bc', 'budget_flow_area', 'budget_flow_storage']:
+                    ds_budget = pd.Series(
+                        data=[df_nodes[b].loc[selection_items[selname]].sum() for selname in node_selections],
+                        index=node_selections)
+                    df_all[b] = ds_budget
 
         return df_all
@@ -12,6 +12,106 @@ class User:
         # add custom child-classes here
         self.df = UserPd(doc)
 
+        # memo of evaluated expressions {(item_type, expression id): (simulation time, values)}
+        self._expr_cache = {}
+
+    # number of items evaluated per chunk if no array-returning kernel call is available
+    expr_chunk_size = 65536
+
+    def expr_id(self, expr, item_type="NODAL"):
+        """
+        Return the id of a user expression given by name or id.
+
+        :param expr:      name or id of the expression
+        :type expr:       str or int
+        :param item_type: "NODAL" or "ELEMENTAL"
+        :type item_type:  str
+        :return:          id of the expression
+        :rtype:           int
+        """
+        if type(expr) == str:
+            if item_type == "NODAL":
+                exprID = self.doc.getNodalExprDistrIdByName(expr)
+            elif item_type == "ELEMENTAL":
+                exprID = self.doc.getElementalExprDistrIdByName(expr)
+            else:
+                raise ValueError("item_type must be 'NODAL' or 'ELEMENTAL'")
+        elif type(expr) == int:
+            exprID = expr
+        else:
+            raise ValueError("expr must be string (for name) or integer (for id)")
+
+        if exprID == -1:
+            raise ValueError("Expression " + str(expr) + " not found!")
+        return exprID
+
+    def expr_values(self, expr, item_type="NODAL", items=None, use_cache=False):
+        """
+        Evaluate a nodal or elemental user expression for all items (or the given items) at once.
+        Uses an array-returning kernel call if the FEFLOW version provides one (items are taken from the result),
+        otherwise evaluates the items in chunks into a preallocated array.
+
+        With use_cache=True, results for all items are memorized per simulation time, so the same expression is not
+        evaluated twice within a time step. The memo can not detect changes of parameters or distributions the
+        expression depends on, nor new results of a steady-state run (the simulation time does not change); call
+        clear_expr_cache() in these cases.
+
+        :param expr:      name or id of the expression
+        :type expr:       str or int
+        :param item_type: "NODAL" or "ELEMENTAL"
+        :type item_type:  str
+        :param items:     node or element numbers to evaluate (default: all)
+        :type items:      array-like or None
+        :param use_cache: If True, use and update the memo of evaluated expressions (default: False).
+        :type use_cache:  bool
+        :return:          numpy.ndarray (float64)
+        """
+        import numpy as np
+
+        exprID = self.expr_id(expr, item_type=item_type)
+        if item_type == "NODAL":
+            n_items = self.doc.getNumberOfNodes()
+            get_value, get_values = self.doc.getNodalExprDistrValue, "getNodalExprDistrValues"
+        else:
+            n_items = self.doc.getNumberOfElements()
+            get_value, get_values = self.doc.getElementalExprDistrValue, "getElementalExprDistrValues"
+        if items is not None:
+            items = np.asarray(items, dtype=np.int64)
+
+        key = (item_type, exprID)
+        time = self.doc.getAbsoluteSimulationTime()
+        if use_cache and key in self._expr_cache and self._expr_cache[key][0] == time:
+            values = self._expr_cache[key][1]
+            return values.copy() if items is None else values[items]
+
+        if hasattr(self.doc, get_values):
+            values = np.array(getattr(self.doc, get_values)(exprID), dtype=np.float64)
+        elif items is not None and not use_cache:
+            # evaluate the given items only
+            values = np.empty(len(items))
+            for start in range(0, len(items), self.expr_chunk_size):
+                chunk = items[start:start + self.expr_chunk_size]
+                values[start:start + len(chunk)] = [get_value(exprID, int(i)) for i in chunk]
+            return values
+        else:
+            values = np.empty(n_items)
+            for start in range(0, n_items, self.expr_chunk_size):
+                stop = min(start + self.expr_chunk_size, n_items)
+                values[start:stop] = [get_value(exprID, i) for i in range(start, stop)]
+
+        if use_cache:
+            values.flags.writeable = False
+            self._expr_cache[key] = (time, values)
+            return values.copy() if items is None else values[items]
+        return values if items is None else values[items]
+
+    def clear_expr_cache(self):
+        """
+        Discard memorized expression values (see expr_values(use_cache=True)), e.g. after changing parameters the
+        expressions depend on or after a steady-state simulation run.
+        """
+        self._expr_cache = {}
+
     def get_type(self, name):
         """
         Returns the item type ("ELEMENTAL" or "NODAL) and distribution type ("DISTRIBUTION" or "EXPRESSION") of a 
@@ -109,4 +209,5 @@ class User:
                     raise RuntimeError("len(itemlist) must match number of nodes!")
                 self.doc.setElementalRefDistrValues(ref_id, itemlist)
 
+        self.doc.c.mesh.values_changed()
         return ref_id
\ No newline at end of file
@@ -0,0 +1,30 @@
+import unittest
+import numpy as np
+import ifm_contrib as ifm
+from ifm import Enum
+
+
+class TestContent(unittest.TestCase):
+
+    def test_content(self):
+        doc = ifm.loadDocument("./models/example_2D.fem")
+
+        # domain totals equal the sum of the elemental content
+        df = doc.c.content.df.content(content_types=Enum.TOTAL_VOLUME)
+        volumes = [doc.getElementalContent(Enum.TOTAL_VOLUME, e) for e in range(doc.getNumberOfElements())]
+        self.assertAlmostEqual(df.loc[Enum.TOTAL_VOLUME, "Model Domain"], sum(volumes))
+
+        # selection totals
+        df = doc.c.content.df.content(selection="conversiontest_el", content_types=[Enum.TOTAL_VOLUME])
+        items = doc.c.sel.list("conversiontest_el", seltype=Enum.SEL_ELEMS)
+        self.assertAlmostEqual(df.loc[Enum.TOTAL_VOLUME, "conversiontest_el"], np.sum(np.array(volumes)[items]))
+
+        # bulk values
+        np.testing.assert_allclose(doc.c.content.values(Enum.TOTAL_VOLUME), volumes)
+        np.testing.assert_allclose(doc.c.content.values(Enum.TOTAL_VOLUME, items=[3, 1]), [volumes[3], volumes[1]])
+
+        doc.closeDocument()
+
+
+if __name__ == '__main__':
+    unittest.main()
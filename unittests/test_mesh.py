@@ -1,5 +1,9 @@
+import importlib.util
 import unittest
+from unittest import mock
+import numpy as np
 import ifm_contrib as ifm
+from ifm import Enum
 
 class TestMesh(unittest.TestCase):
 
@@ -7,6 +11,16 @@ class TestMesh(unittest.TestCase):
         doc = ifm.loadDocument("./models/example_2D.fem")
         doc.c.mesh.available_aux()
 
+    def test_parameter_catalog(self):
+        doc = ifm.loadDocument("./models/example_3D_mspecies.fem")
+        df_catalog = doc.c.mesh.parameter_catalog()
+        self.assertEqual(df_catalog.loc["P_HEAD"].Type, "nodal")
+        self.assertIs(doc.c.mesh.parameter_catalog(), df_catalog)  # reused
+        self.assertEqual(doc.c.mesh.parameter_name(Enum.P_HEAD), "P_HEAD")
+        self.assertIn(Enum.P_HEAD, doc.c.mesh.df.get_available_items(Type="nodal").index)
+        self.assertEqual(doc.c.mesh.available_aux()["nodal"],
+                         list(df_catalog[df_catalog.Aux & df_catalog.Available & (df_catalog.Type == "nodal")].index))
+
     def test_get_imatrix(self):
         doc =  ifm.loadDocument("./models/example_2D.fem")
         self.assertEqual(len(doc.c.mesh.get_imatrix()), 959)
@@ -71,13 +85,154 @@ class TestMesh(unittest.TestCase):
         with self.assertRaises(ValueError):
             doc.c.mesh.get_imatrix2d(slice=4)
 
+    def test_topology(self):
+        doc = ifm.loadDocument("./models/example_3D_mspecies.fem")
+        topology = doc.c.mesh.topology()
+        self.assertIs(topology, doc.c.mesh.topology())
+        self.assertEqual(len(topology.offsets), doc.getNumberOfElements() + 1)
+        for e in [0, 500, doc.getNumberOfElements() - 1]:
+            self.assertEqual(list(topology.element_nodes(e)),
+                             [doc.getNode(e, N) for N in range(doc.getNumberOfElementNodes(e))])
+        self.assertEqual(int(topology.active.sum()),
+                         len([e for e in range(doc.getNumberOfElements()) if doc.getMatElementActive(e)]))
+        self.assertIsNot(topology, doc.c.mesh.topology(rebuild=True))
+
+    def test_topology_live(self):
+        doc = ifm.loadDocument("./models/example_3D_mspecies.fem")
+        topology = doc.c.mesh.topology()
+
+        # elevations are re-read from the kernel
+        z = doc.getParamValue(Enum.P_ELEV, 0)
+        doc.setParamValue(Enum.P_ELEV, 0, z + 1.)
+        self.assertIs(doc.c.mesh.topology(), topology)
+        self.assertAlmostEqual(topology.coordinates()[2][0], z + 1.)
+
+        # the active mask follows (de)activation of elements
+        doc.setMatElementActive(0, 0)
+        self.assertFalse(doc.c.mesh.topology().active[0])
+        expected = [bool(doc.getMatElementActive(1)), False]
+        with mock.patch.object(doc, "getMatElementActive", wraps=doc.getMatElementActive) as active:
+            self.assertEqual(list(topology.active_mask([1, 0])), expected)
+            self.assertEqual(active.call_count, 2)
+        doc.setMatElementActive(0, 1)
+        self.assertTrue(doc.c.mesh.topology().active[0])
+
+    def test_topology_layered(self):
+        doc = ifm.loadDocument("./models/example_3D_mspecies.fem")
+        topology = doc.c.mesh.topology()
+        self.assertTrue(topology.is_layered)
+        self.assertEqual([list(topology.element_nodes(e)) for e in range(doc.getNumberOfElements())],
+                         [[doc.getNode(e, N) for N in range(doc.getNumberOfElementNodes(e))]
+                          for e in range(doc.getNumberOfElements())])
+
+        doc = ifm.loadDocument("./models/example_partial_unstruct.fem")
+        topology = doc.c.mesh.topology()
+        self.assertFalse(topology.is_layered)
+        self.assertEqual([list(topology.element_nodes(e)) for e in range(doc.getNumberOfElements())],
+                         [[doc.getNode(e, N) for N in range(doc.getNumberOfElementNodes(e))]
+                          for e in range(doc.getNumberOfElements())])
+
+    def test_locate(self):
+        doc = ifm.loadDocument("./models/example_2D.fem")
+        df = doc.c.mesh.df.elements(centroids=True)
+        location = doc.c.mesh.locate(df[["cx", "cy"]].values)
+        self.assertEqual(list(location.elements), list(df.index))
+        self.assertTrue(((location.weights.sum(axis=1) - 1.) ** 2 < 1e-12).all())
+        self.assertEqual(doc.c.mesh.locate([[-1e20, -1e20]]).elements[0], -1)
+
+        doc = ifm.loadDocument("./models/example_3D_mspecies.fem")
+        df = doc.c.mesh.df.elements(centroids=True)
+        location = doc.c.mesh.locate(df[["cx", "cy", "cz"]].values)
+        self.assertEqual(list(location.elements), list(df.index))
+
+    def test_interpolate(self):
+        doc = ifm.loadDocument("./models/example_2D.fem")
+        df = doc.c.mesh.df.nodes(par={"Head": Enum.P_HEAD})
+        location = doc.c.mesh.locate(df[["X", "Y"]].values)
+        values = doc.c.mesh.interpolate(location, par=Enum.P_HEAD)
+        self.assertTrue(np.allclose(values, df.Head.values, equal_nan=True))
+
+        # no-data in given values is masked as well
+        head = doc.getParamValues(Enum.P_HEAD)
+        values = doc.c.mesh.interpolate(location, values=[-99999.] + list(head[1:]))
+        self.assertTrue(np.isnan(values[0]))
+        other = ~((location.nodes == 0) & (location.weights != 0)).any(axis=1)
+        self.assertTrue(np.allclose(values[other], df.Head.values[other], equal_nan=True))
+
+        # no-data at the padding node of a triangle does not affect the result
+        from ifm_contrib.contrib_lib.mesh_locator import PointLocation
+        location = PointLocation(np.array([5]), np.array([[3, 4, 5, 0]]), np.array([[0.2, 0.3, 0.5, 0.]]))
+        values = np.array([np.nan, 1., 1., 1., 2., 3.])
+        self.assertAlmostEqual(location.interpolate(values)[0], 0.2 + 0.6 + 1.5)
+
+    @unittest.skipUnless(importlib.util.find_spec("scipy"), "requires scipy (sparse extra)")
+    def test_interpolate_sparse(self):
+        doc = ifm.loadDocument("./models/example_2D.fem")
+        df = doc.c.mesh.df.nodes(par={"Head": Enum.P_HEAD})
+        location = doc.c.mesh.locate(df[["X", "Y"]].values)
+        matrix = location.as_sparse(doc.getNumberOfNodes())
+        self.assertEqual(matrix.shape, (len(location), doc.getNumberOfNodes()))
+        head = np.asarray(doc.getParamValues(Enum.P_HEAD))
+        found = location.found
+        np.testing.assert_allclose((matrix @ head)[found], location.interpolate(head)[found])
+
+    def test_slice_layer_array(self):
+        doc = ifm.loadDocument("./models/example_3D_mspecies.fem")
+        z = doc.c.mesh.slice_array(par=Enum.P_ELEV)
+        self.assertEqual(z.shape, (doc.getNumberOfSlices(), doc.getNumberOfNodesPerSlice()))
+        self.assertEqual(z[1, 5], doc.getZ(doc.getNumberOfNodesPerSlice() + 5))
+        self.assertTrue((z[:-1] >= z[1:]).all())
+
+        values = np.arange(doc.getNumberOfElements(), dtype=float)
+        layers = doc.c.mesh.layer_array(values=values)
+        self.assertEqual(layers.shape, (doc.getNumberOfLayers(), doc.getNumberOfElementsPerLayer()))
+        self.assertTrue(np.shares_memory(layers, values))
+
+        doc = ifm.loadDocument("./models/example_fully_unstruct.fem")
+        with self.assertRaises(ValueError):
+            doc.c.mesh.layer_array(values=np.zeros(doc.getNumberOfElements()))
+
+    def test_cache(self):
+        import gc
+        import shutil
+        import tempfile
+        cache_dir = tempfile.mkdtemp()
+        try:
+            doc = ifm.loadDocument("./models/example_2D.fem", cache_dir=cache_dir)
+            imat = doc.c.mesh.get_imatrix()
+            borders = doc.c.mesh.get_borders()
+            self.assertTrue(doc.c.mesh.cache.exists("topology"))
+            self.assertTrue(doc.c.mesh.cache.exists("borders"))
+
+            doc = ifm.loadDocument("./models/example_2D.fem", cache_dir=cache_dir)
+            self.assertEqual(doc.c.mesh.get_imatrix(), imat)
+            self.assertEqual(doc.c.mesh.get_borders(), borders)
+
+            # the cache is not used if the mesh in memory was edited
+            doc = ifm.loadDocument("./models/example_2D.fem", cache_dir=cache_dir)
+            x = doc.getParamValue(Enum.P_MSH_X, 0)
+            doc.setParamValue(Enum.P_MSH_X, 0, x + 1.)
+            self.assertFalse(doc.c.mesh._use_cache())
+            self.assertAlmostEqual(doc.c.mesh.topology().x[0], x + 1.)
+            doc.closeDocument()
+        finally:
+            # release the memory-mapped arrays before removing the folder
+            doc = None
+            gc.collect()
+            shutil.rmtree(cache_dir, ignore_errors=True)
+
     def test_getCentroid(self):
         doc = ifm.loadDocument("./models/example_2D.fem")
         doc.c.mesh.getCentroid(0)
 
     def test_mlw(self):
         doc = ifm.loadDocument("./models/example_3D_mspecies.fem")
-        doc.c.mesh.mlw()
+        wells = doc.c.mesh.mlw()
+        for i, (top, bottom) in enumerate(zip(wells["top_node"], wells["bottom_node"])):
+            self.assertEqual(wells["screen_nodes"][i][0], top)
+            self.assertEqual(wells["screen_nodes"][i][-1], bottom)
+        snapshot = doc.c.mesh.mlw_snapshot(wells)
+        self.assertEqual(len(snapshot["head_mean"]), len(wells["mlw_id"]))
 
 
 if __name__ == '__main__':
@@ -1,4 +1,5 @@
 import unittest
+import numpy as np
 import ifm_contrib as ifm
 from ifm import Enum
 
@@ -23,6 +24,52 @@ class TestMeshGpd(unittest.TestCase):
         doc.c.mesh.gdf.elements(content=Enum.TOTAL_VOLUME)
         doc.c.mesh.gdf.elements(content=[Enum.TOTAL_VOLUME, Enum.VOID_VOLUME])
 
+    def test_elements_polygons(self):
+        doc = ifm.loadDocument("./models/example_2D.fem")
+        gdf = doc.c.mesh.gdf.elements()
+        self.assertEqual(len(gdf), doc.getNumberOfElements())
+        self.assertTrue(gdf.geometry.is_valid.all())
+        self.assertEqual(list(gdf.geometry.iloc[0].exterior.coords)[0][0],
+                         doc.getX(doc.getNode(0, 0)) + doc.getOriginX())
+
+        doc = ifm.loadDocument("./models/example_3D_mspecies.fem")
+        gdf = doc.c.mesh.gdf.elements(as_2d=True)
+        self.assertEqual(len(gdf), doc.getNumberOfElementsPerLayer())
+
+    def test_elements_footprint(self):
+        doc = ifm.loadDocument("./models/example_3D_mspecies.fem")
+        ee = doc.getNumberOfElementsPerLayer()
+
+        # long frame: all layers share the geometry objects of the first layer
+        gdf = doc.c.mesh.gdf.elements(par=Enum.P_CONDX, as_2d=True, stacked=True)
+        self.assertEqual(len(gdf), doc.getNumberOfElements())
+        self.assertIs(gdf.geometry.values[0], gdf.geometry.values[ee])
+
+        # wide frame: one row per footprint element, values per layer
+        gdf = doc.c.mesh.gdf.elements(par={"K": Enum.P_CONDX}, as_2d=True, layer=[1, 2])
+        self.assertEqual(len(gdf), ee)
+        self.assertIn("K_2", gdf.columns)
+
+        self.assertNotIn("LAYER", gdf.columns)
+
+        # parameters given as ifm.Enum are named after their constant
+        gdf = doc.c.mesh.gdf.elements(par=Enum.P_CONDX, as_2d=True, layer=[1, 2])
+        self.assertIn("P_CONDX_2", gdf.columns)
+
+        # single layer
+        gdf = doc.c.mesh.gdf.elements(par={"K": Enum.P_CONDX}, layer=2)
+        self.assertEqual(list(gdf.index), list(range(ee, 2 * ee)))
+
+        # selections of deeper layers are mapped to the footprint in the wide frame
+        gdf = doc.c.mesh.gdf.elements(as_2d=True, layer=[1, 2], selection=[ee + 5])
+        self.assertEqual(list(gdf.index), [5])
+
+        # expressions given by id
+        doc = ifm.loadDocument("./models/example_2D.fem")
+        exprID = doc.getElementalExprDistrIdByName("elemental_expr_test")
+        gdf = doc.c.mesh.gdf.elements(expr=[exprID])
+        self.assertIn(exprID, gdf.columns)
+
     def test_nodes(self):
         doc = ifm.loadDocument("./models/example_2D.fem")
         doc.c.mesh.gdf.nodes(par=Enum.P_HEAD)   # 0
@@ -45,9 +92,47 @@ class TestMeshGpd(unittest.TestCase):
         self.assertAlmostEqual(df.budget_flow_area.sum(), 23.580393938311079)
         self.assertAlmostEqual(df.budget_flow_storage.sum(), -18.378763638890959)
 
+    def test_nodes_points(self):
+        doc = ifm.loadDocument("./models/example_2D.fem")
+        gdf = doc.c.mesh.gdf.nodes()
+        self.assertFalse(gdf.geometry.has_z.any())
+        self.assertTrue(np.allclose(gdf.geometry.x, gdf.X))
+        self.assertTrue(np.allclose(gdf.geometry.y, gdf.Y))
+        gdf = doc.c.mesh.gdf.border_nodes()
+        self.assertTrue(np.allclose(gdf.geometry.x, gdf.X))
+
+        # 3D points with node elevation
+        doc = ifm.loadDocument("./models/example_3D_mspecies.fem")
+        gdf = doc.c.mesh.gdf.nodes(slice=2)
+        self.assertTrue(gdf.geometry.has_z.all())
+        z = doc.getParamValues(Enum.P_ELEV)
+        self.assertTrue(np.allclose(gdf.geometry.z, [z[n] for n in gdf.index]))
+
+    def test_model_area(self):
+        doc = ifm.loadDocument("./models/example_2D.fem")
+        gdf = doc.c.mesh.gdf.model_area()
+        self.assertTrue(gdf.geometry.is_valid.all())
+
+        # outline of a selection equals the union of the element polygons
+        gdf = doc.c.mesh.gdf.model_area(selection="conversiontest_el")
+        union = doc.c.mesh.gdf.elements(selection="conversiontest_el").geometry.union_all()
+        self.assertEqual(len(gdf), 1)
+        self.assertTrue(gdf.geometry[0].is_valid)
+        self.assertAlmostEqual(gdf.geometry[0].symmetric_difference(union).area, 0., places=6)
+
+        # a hole is created if an element away from the borders is left out
+        all_elements = list(range(doc.getNumberOfElements()))
+        _, offsets, elements = doc.c.mesh.topology().edges
+        border_elements = set(elements[offsets[:-1][np.diff(offsets) == 1]])
+        inner = [e for e in all_elements if e not in border_elements][0]
+        n_holes = len(doc.c.mesh.gdf.model_area(selection=all_elements).geometry[0].interiors)
+        gdf = doc.c.mesh.gdf.model_area(selection=[e for e in all_elements if e != inner])
+        self.assertEqual(len(gdf.geometry[0].interiors), n_holes + 1)
+
     def test_mlw(self):
         doc = ifm.loadDocument("./models/example_3D_mspecies.fem")
-        doc.c.mesh.gdf.mlw()
+        gdf = doc.c.mesh.gdf.mlw()
+        self.assertTrue(np.allclose(gdf.geometry.z, gdf.bottom_z))
 
 
 if __name__ == '__main__':
@@ -1,4 +1,7 @@
+import importlib.util
 import unittest
+import numpy as np
+import pandas as pd
 import ifm_contrib as ifm
 from ifm import Enum
 
@@ -42,6 +45,17 @@ class TestMeshPd(unittest.TestCase):
 
 
 
+    def test_elements_centroids(self):
+        doc = ifm.loadDocument("./models/example_3D_mspecies.fem")
+        df = doc.c.mesh.df.elements(centroids=True)
+        for e in [0, 500, doc.getNumberOfElements() - 1]:
+            x, y, z = doc.c.mesh.getCentroid(e)
+            self.assertAlmostEqual(df.cx[e], x)
+            self.assertAlmostEqual(df.cy[e], y)
+            self.assertAlmostEqual(df.cz[e], z)
+            self.assertEqual(len(df.centroid[e]), 3)
+        self.assertNotIn("centroid", doc.c.mesh.df.elements(centroids=True, centroid_tuples=False).columns)
+
     def test_nodes(self):
         doc = ifm.loadDocument("./models/example_2D.fem")
         doc.c.mesh.df.nodes(par=Enum.P_HEAD)   # 0
@@ -71,11 +85,154 @@ class TestMeshPd(unittest.TestCase):
         self.assertAlmostEqual(df.budget_flow_area.sum(), 23.580393938311079)
         self.assertAlmostEqual(df.budget_flow_storage.sum(), -18.378763638890959)
 
+        # budget of selected nodes only equals the subset of the full budget
+        df_sel = doc.c.mesh.df.nodes(budget="flow", selection=list(range(10)))
+        self.assertEqual(len(df_sel), 10)
+        self.assertAlmostEqual(df_sel.budget_flow_area.sum(), df.budget_flow_area.iloc[:10].sum())
+        components = doc.c.bdgt.nodal_budget("flow")
+        self.assertAlmostEqual(components["bc"].sum(), -5.2016302997540258)
+
         doc = ifm.loadDocument("./models/example_3D_mspecies.fem")
         doc.c.mesh.df.nodes(aux="auxSliceDistance")
         doc.c.mesh.df.nodes(aux=["auxSliceDistance"])
         doc.c.mesh.df.nodes(aux={"slice_distance": "auxSliceDistance"})
 
+    def test_filter_pushdown(self):
+        doc = ifm.loadDocument("./models/example_3D_mspecies.fem")
+
+        # filtered frames equal the filtered full frames
+        df_all = doc.c.mesh.df.nodes(par=Enum.P_HEAD)
+        df = doc.c.mesh.df.nodes(par=Enum.P_HEAD, slice=2)
+        pd.testing.assert_frame_equal(df, df_all.loc[df_all.SLICE == 2])
+
+        df_all = doc.c.mesh.df.elements(par=Enum.P_CONDX)
+        df = doc.c.mesh.df.elements(par=Enum.P_CONDX, layer=[1, 2])
+        pd.testing.assert_frame_equal(df, df_all.loc[df_all.LAYER.isin([1, 2])])
+
+    def test_lazy(self):
+        doc = ifm.loadDocument("./models/example_2D.dac")
+        doc.pdoc.loadTimeStep(1)
+
+        frame = doc.c.mesh.df.nodes(lazy=True)
+        self.assertIn("P_HEAD", frame.columns)
+        self.assertEqual(frame.cached, [])
+        df = doc.c.mesh.df.nodes(par={"P_HEAD": Enum.P_HEAD})
+        np.testing.assert_allclose(frame["P_HEAD"].values, df.P_HEAD.values)
+        np.testing.assert_allclose(frame[Enum.P_HEAD].values, df.P_HEAD.values)
+        self.assertEqual(frame.cached, ["P_HEAD"])
+
+        # columns are discarded if the time step changes
+        doc.pdoc.loadTimeStep(2)
+        self.assertEqual(frame.cached, [])
+
+        # ... and after values changed through ifm_contrib
+        frame["P_HEAD"]
+        doc.c.user.create(Enum.SEL_NODAL, "lazy_test", itemlist=list(range(doc.getNumberOfNodes())))
+        self.assertEqual(frame.cached, [])
+        self.assertIn("lazy_test", frame.columns)
+
+        with self.assertRaises(ValueError):
+            doc.c.mesh.df.elements(par=Enum.P_CONDX, lazy=True)
+
+    def test_iter(self):
+        doc = ifm.loadDocument("./models/example_3D_mspecies.fem")
+
+        chunks = list(doc.c.mesh.df.iter_nodes(chunk_size=1000, par=Enum.P_HEAD))
+        self.assertTrue(all(len(df) <= 1000 for df in chunks))
+        pd.testing.assert_frame_equal(pd.concat(chunks), doc.c.mesh.df.nodes(par=Enum.P_HEAD))
+
+        chunks = list(doc.c.mesh.df.iter_elements(chunk_size=1000, layer=2, par=Enum.P_CONDX))
+        pd.testing.assert_frame_equal(pd.concat(chunks), doc.c.mesh.df.elements(layer=2, par=Enum.P_CONDX))
+
+        # columns are fetched once, not once per chunk
+        from unittest import mock
+        for chunk_size in [100, 1000]:
+            with mock.patch.object(doc, "getParamValues", wraps=doc.getParamValues) as get_values:
+                n_chunks = len(list(doc.c.mesh.df.iter_nodes(chunk_size=chunk_size, par=Enum.P_HEAD)))
+            self.assertGreater(n_chunks, 1)
+            self.assertEqual(get_values.call_count, 3)  # X, Y and P_HEAD
+
+    def test_dtypes(self):
+        doc = ifm.loadDocument("./models/example_3D_mspecies.fem")
+
+        df = doc.c.mesh.df.nodes(par=Enum.P_HEAD)
+        df_compact = doc.c.mesh.df.nodes(par=Enum.P_HEAD, dtypes="compact")
+        self.assertEqual(df_compact[Enum.P_HEAD].dtype, np.float32)
+        self.assertEqual(df_compact.TOP_NODE.dtype, np.int32)
+        self.assertEqual(df_compact.SLICE.dtype, "category")
+        np.testing.assert_allclose(df_compact[Enum.P_HEAD].values, df[Enum.P_HEAD].values, rtol=1e-6)
+
+        df = doc.c.mesh.df.elements(dtypes={"layer": "Int32"})
+        self.assertEqual(df.LAYER.dtype, "Int32")
+
+        with self.assertRaises(ValueError):
+            doc.c.mesh.df.nodes(dtypes="unknown")
+
+    @unittest.skipUnless(importlib.util.find_spec("pyarrow"), "requires pyarrow (parquet extra)")
+    def test_to_parquet(self):
+        import os
+        import tempfile
+
+        doc = ifm.loadDocument("./models/example_2D.dac")
+        with tempfile.TemporaryDirectory() as folder:
+            files = doc.c.mesh.df.to_parquet(folder, par={"head": Enum.P_HEAD}, time_steps=[0, 1])
+            self.assertEqual(len(files), 3)
+            df = pd.read_parquet(os.path.join(folder, "nodes.parquet"))
+            self.assertEqual(len(df), doc.getNumberOfNodes())
+
+            doc.loadTimeStep(1)
+            df = pd.read_parquet(os.path.join(folder, "nodes_results", "file_index=1"))
+            np.testing.assert_allclose(df["head"].values,
+                                       doc.c.mesh.df.nodes(par={"head": Enum.P_HEAD})["head"].values)
+
+            files = doc.c.mesh.df.to_parquet(folder, items="elements")
+            df = pd.read_parquet(files[0])
+            self.assertEqual(len(df), doc.getNumberOfElements())
+
+            with self.assertRaises(ValueError):
+                doc.c.mesh.df.to_parquet(folder, distr="distr_does_not_exist")
+
+    def test_dfe(self):
+        doc = ifm.loadDocument("./models/example_3D_mspecies.fem")
+        df = doc.c.mesh.df.dfe()
+        self.assertEqual(len(df), doc.getNumberOfTotalFractureElements())
+        self.assertEqual(len(doc.c.dfe.df.dfe()), len(df))
+
+    def test_expr_values(self):
+        doc = ifm.loadDocument("./models/example_2D.fem")
+        exprID = doc.getNodalExprDistrIdByName("nodal_expr_test")
+        values = doc.c.user.expr_values("nodal_expr_test")
+        self.assertEqual(list(values), [doc.getNodalExprDistrValue(exprID, n) for n in range(doc.getNumberOfNodes())])
+        self.assertEqual(list(doc.c.user.expr_values("nodal_expr_test", items=[3, 1])), [values[3], values[1]])
+
+        # the memo is opt-in, values are live by default
+        cached = doc.c.user.expr_values(exprID, use_cache=True)
+        self.assertEqual(list(cached), list(values))
+        self.assertTrue(cached.flags.writeable)
+        doc.c.user.clear_expr_cache()
+        self.assertEqual(list(doc.c.user.expr_values(exprID)), list(doc.c.user.expr_values(exprID, use_cache=True)))
+        with self.assertRaises(ValueError):
+            doc.c.user.expr_values("expr_does_not_exist")
+
+    def test_edges(self):
+        doc = ifm.loadDocument("./models/example_2D.fem")
+        df = doc.c.mesh.df.edges(method="incidence", verify=True)
+        self.assertEqual(len(df), doc.getNumberOfEdges())
+        df_kernel = doc.c.mesh.df.edges()
+        self.assertAlmostEqual(df.length.sum(), df_kernel.length.sum())
+
+        # default numbering is the kernel edge numbering
+        for d in [0, doc.getNumberOfEdges() - 1]:
+            self.assertEqual(tuple(df_kernel.Nodes[d]), tuple(doc.queryEdgeNodes(d)))
+
+    def test_velocity(self):
+        doc = ifm.loadDocument("./models/example_2D.dac")
+        doc.pdoc.loadTimeStep(1)
+        df = doc.c.mesh.df.nodes(velocity=True)
+        self.assertEqual(list(df.v_x), [doc.getResultsXVelocityValue(n) for n in range(doc.getNumberOfNodes())])
+        for n in [0, doc.getNumberOfNodes() - 1]:
+            self.assertAlmostEqual(df.v_norm[n], doc.getResultsVelocityNormValue(n))
+
     def test_availableitems(self):
         doc = ifm.loadDocument("./models/example_2D.fem")
         doc.c.mesh.df.get_available_items()
@@ -67,6 +67,21 @@ class TestSel(unittest.TestCase):
 
         self.doc.closeDocument()
 
+    def test_sel_grow_shrink(self):
+        self.doc = ifm.loadDocument("./models/example_2D.fem")
+
+        nodes = self.doc.c.sel.convert("conversiontest_el", Enum.SEL_NODAL)
+        elements = self.doc.c.sel.grow("conversiontest_el")
+        self.assertTrue(set([586, 955]).issubset(elements))
+        self.assertEqual(elements, self.doc.c.mesh.topology().elements_of_nodes(nodes).tolist())
+
+        # growing then shrinking an elemental selection must retain the original elements
+        self.assertTrue(set([586, 955]).issubset(self.doc.c.sel.shrink(elements, seltype=Enum.SEL_ELEMENTAL)))
+
+        self.assertEqual(self.doc.c.sel.intersection(["conversiontest_el", elements]), [586, 955])
+
+        self.doc.closeDocument()
+
 
 if __name__ == '__main__':
     unittest.main()